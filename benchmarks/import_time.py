@@ -0,0 +1,50 @@
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+'''
+Import time of puerml in a fresh interpreter, and the heavy modules an import
+pulls in. Exits with 1 when a statement loads a module it must not.
+
+python benchmarks/import_time.py [runs]
+'''
+
+ROOT  = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+HEAVY = ['requests', 'magic', 'numpy', 'sympy', 'gensim', 'sklearn', 'multiprocessing', 'asyncio', 'concurrent.futures']
+
+STATEMENTS = {  # statement: heavy modules it may load
+	'import puerml'                     : [],
+	'from puerml import Jsonl'          : [],
+	'from puerml import DataFrame'      : [],
+	'from puerml import Data'           : [],
+	'from puerml import *'              : [],
+}
+
+SCRIPT = '''
+import sys, time, json
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [m for m in {heavy} if m in sys.modules]]))
+'''
+
+def measure(statement):  # -> seconds, heavy modules loaded
+	code   = SCRIPT.format(statement=statement, heavy=HEAVY)
+	result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+	return json.loads(result.stdout)
+
+
+if __name__ == '__main__':
+	runs   = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+	failed = False
+	print(f'{"statement".ljust(36)} {"median":>10}  heavy modules')
+	for statement, allowed in STATEMENTS.items():
+		results = [measure(statement) for _ in range(runs)]
+		median  = statistics.median(elapsed for elapsed, _ in results)
+		loaded  = results[0][1]
+		extra   = [m for m in loaded if m not in allowed]
+		failed |= bool(extra)
+		print(f'{statement.ljust(36)} {median * 1000:7.1f} ms  {", ".join(loaded) or "-"}{"  <- unexpected" if extra else ""}')
+	sys.exit(1 if failed else 0)
@@ -0,0 +1,57 @@
+import os
+import sys
+import json
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from puerml              import Data
+from puerml.library.data import DataReader
+
+'''
+Text re-packaging throughput, Data.load(src).save(dst, max_size), with the
+per line chunker (_chunk_lines_gen) and the byte level one (_chunk_text_gen)
+
+python benchmarks/text_chunking.py [size_mb] [max_size_mb]
+'''
+
+CHUNKERS = {'lines': DataReader._chunk_lines_gen, 'bytes': DataReader._chunk_text_gen}
+
+def make_jsonl(location, size, width):
+	line = json.dumps({'id': 0, 'text': 'lorem ipsum ' * width, 'score': 0.5})
+	with open(location, 'w') as f:
+		f.write((line + '\n') * (size // (len(line) + 1)))
+
+def chunk(location, max_size, chunker):
+	reader = DataReader.load(location)
+	reader.is_binary = False
+	start = time.perf_counter()
+	for _ in chunker(reader, max_size):
+		pass
+	return time.perf_counter() - start
+
+def save(location, max_size, chunker):
+	DataReader._chunk_text_gen = chunker
+	try:
+		start = time.perf_counter()
+		Data.load(location).save(location + '.out', max_size)
+		return time.perf_counter() - start
+	finally:
+		DataReader._chunk_text_gen = CHUNKERS['bytes']
+
+
+if __name__ == '__main__':
+	size     = int(float(sys.argv[1] if len(sys.argv) > 1 else 256) * 1024**2)
+	max_size = int(float(sys.argv[2] if len(sys.argv) > 2 else 16) * 1024**2)
+	mb       = size / 1024**2
+	print(f'{"source".ljust(26)} {"chunker".ljust(8)} {"chunking":>10} {"save":>10}')
+	with tempfile.TemporaryDirectory() as tmp:
+		for width in (2, 20, 200):
+			location = os.path.join(tmp, f'bench_{width}.jsonl')
+			make_jsonl(location, size, width)
+			Data.load(location).save(location + '.pkg', max_size)
+			for name, source in ((f'file, {width * 12} b text', location), (f'package, {width * 12} b text', location + '.pkg')):
+				for chunker, f in CHUNKERS.items():
+					c, s = chunk(source, max_size, f), save(source, max_size, f)
+					print(f'{name.ljust(26)} {chunker.ljust(8)} {mb / c:6.0f} MB/s {mb / s:6.0f} MB/s')
@@ -1,3 +1,9 @@
-from .        import library
-from .library import *
-from .util    import *
\ No newline at end of file
+from .        import library, util
+from .util    import *
+
+__all__ = [*library.__all__, *util.__all__]
+
+def __getattr__(name):  # library names are imported on first access
+	if name in library.__all__:
+		return getattr(library, name)
+	raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
\ No newline at end of file
@@ -1,11 +1,37 @@
-from .benchmark  import Benchmark
-from .data       import Data
-from .data_frame import DataFrame
-from .jsonl      import Jsonl
+import importlib
+
+# Names are imported from their modules on first access (PEP 562), so
+# "from puerml import Jsonl" does not pay for DataFrame, ColumnStore ...
+_modules = {
+	'Benchmark'         : 'benchmark',
+	'Cache'             : 'cache',
+	'ColumnStore'       : 'column_store',
+	'ColumnarDataFrame' : 'columnar',
+	'Data'              : 'data',
+	'DataFrame'         : 'data_frame',
+	'DataFrameScan'     : 'scan',
+	'Jsonl'             : 'jsonl',
+	'Schema'            : 'schema',
+}
 
 __all__ = [
 	'Benchmark',
+	'Cache',
+	'ColumnStore',
+	'ColumnarDataFrame',
 	'Data',
 	'DataFrame',
+	'DataFrameScan',
 	'Jsonl',
-]
\ No newline at end of file
+	'Schema',
+]
+
+def __getattr__(name):
+	if name in _modules:
+		value = getattr(importlib.import_module(f'.{_modules[name]}', __name__), name)
+		globals()[name] = value
+		return value
+	raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+	return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -0,0 +1,187 @@
+import io
+import os
+import bisect
+import zipfile
+
+from puerml.util import File, Pool
+
+__all__ = ['ChunkStream', 'MultiPartFile', 'Archive']
+
+
+'''
+Streaming zip / unzip of directories for Data.zip and Data.unzip
+
+Data.zip('mydir').save('mydir.zip', max_size)   archive is produced block by
+                                                block while parts are written
+Data.load('mydir.zip').unzip('mydir')           members are read across package
+                                                parts and extracted in parallel
+'''
+
+class ChunkStream:  # read-only file over a bytes chunks iterator
+	def __init__(self, chunks):
+		self.chunks = iter(chunks)
+		self.buffer = bytearray()
+
+	def read(self, size=-1):
+		while size < 0 or len(self.buffer) < size:
+			chunk = next(self.chunks, None)
+			if chunk is None:
+				break
+			self.buffer += chunk
+		size = len(self.buffer) if size < 0 else size
+		data = bytes(self.buffer[:size])
+		del self.buffer[:size]
+		return data
+
+	def readinto(self, buffer):
+		view = memoryview(buffer).cast('B')
+		data = self.read(len(view))
+		view[:len(data)] = data
+		return len(data)
+
+	def close(self):
+		self.buffer.clear()
+
+############################################################
+
+class MultiPartFile(io.RawIOBase):  # read-only seekable file over package part paths
+	def __init__(self, paths):
+		self.paths    = list(paths)
+		self.starts   = [0]
+		self.position = 0
+		self._n       = None
+		self._file    = None
+		for path in self.paths:
+			self.starts.append(self.starts[-1] + os.path.getsize(path))
+
+	@property
+	def size(self):
+		return self.starts[-1]
+
+	def readable(self):
+		return True
+
+	def seekable(self):
+		return True
+
+	def tell(self):
+		return self.position
+
+	def seek(self, offset, whence=io.SEEK_SET):
+		base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence]
+		self.position = max(base + offset, 0)
+		return self.position
+
+	def _part(self, n):
+		if self._n != n:
+			if self._file:
+				self._file.close()
+			self._file = open(self.paths[n], 'rb')
+			self._n    = n
+		return self._file
+
+	def readinto(self, buffer):  # reads up to the end of the current part
+		if self.position >= self.size:
+			return 0
+		n    = bisect.bisect_right(self.starts, self.position) - 1
+		file = self._part(n)
+		file.seek(self.position - self.starts[n])
+		view  = memoryview(buffer).cast('B')
+		count = file.readinto(view[:self.starts[n + 1] - self.position])
+		self.position += count
+		return count
+
+	def read(self, size=-1):  # full reads across part boundaries, zipfile relies on them
+		size   = self.size - self.position if size is None or size < 0 else min(size, self.size - self.position)
+		buffer = bytearray(max(size, 0))
+		view   = memoryview(buffer)
+		done   = 0
+		while done < size:
+			count = self.readinto(view[done:])
+			if not count:
+				break
+			done += count
+		return bytes(buffer[:done])
+
+	def close(self):
+		if self._file:
+			self._file.close()
+			self._file = None
+		super().close()
+
+############################################################
+
+class _Sink:  # non-seekable zipfile output, drained by Archive.zip_gen
+	def __init__(self):
+		self.buffer = bytearray()
+
+	def write(self, data):
+		self.buffer += data
+		return len(data)
+
+	def flush(self):
+		pass
+
+	def drain(self):
+		if self.buffer:
+			data = bytes(self.buffer)
+			self.buffer.clear()
+			yield data
+
+############################################################
+
+class Archive:
+	block_size = 1024**2
+
+	@staticmethod
+	def zip_gen(location):  # -> zip archive of a directory as bytes chunks
+		sink = _Sink()
+		with zipfile.ZipFile(sink, 'w') as zf:
+			for root, _, files in os.walk(location):
+				for file in files:
+					path = os.path.join(root, file)
+					info = zipfile.ZipInfo.from_file(path, os.path.relpath(path, start=location))
+					with open(path, 'rb') as src, zf.open(info, 'w') as dst:
+						for block in iter(lambda: src.read(Archive.block_size), b''):
+							dst.write(block)
+							yield from sink.drain()
+					yield from sink.drain()
+		yield from sink.drain()
+
+	@staticmethod
+	def local_parts(location):  # -> part paths of a local package or [location]
+		if not os.path.isdir(location):
+			return [location]
+		paths = []
+		while os.path.isfile(os.path.join(location, str(len(paths)))):
+			paths.append(os.path.join(location, str(len(paths))))
+		if not paths:
+			raise FileNotFoundError(os.path.join(location, '0'))
+		return paths
+
+	@staticmethod
+	def _extract(paths, location, members):
+		with zipfile.ZipFile(MultiPartFile(paths)) as zf:
+			for member in members:
+				zf.extract(member, location)
+
+	@staticmethod
+	def unzip(paths, location, workers=None):  # members are split between workers, each reading its own handles
+		File.rm(location)
+		with zipfile.ZipFile(MultiPartFile(paths)) as zf:
+			members = sorted(zf.infolist(), key=lambda m: m.file_size, reverse=True)
+
+		root = os.path.abspath(location)
+		for member in members:
+			target = os.path.abspath(os.path.join(root, member.filename))
+			if target.startswith(root + os.sep):
+				os.makedirs(target if member.is_dir() else os.path.dirname(target), exist_ok=True)
+
+		workers = max(1, min(workers or min(8, os.cpu_count() or 1), len(members)))
+		if workers == 1:
+			Archive._extract(paths, location, members)
+			return
+		with Pool.executor(workers, 'thread') as executor:
+			groups = [members[n::workers] for n in range(workers)]
+			for future in [executor.submit(Archive._extract, paths, location, group) for group in groups]:
+				future.result()
@@ -0,0 +1,61 @@
+import asyncio
+
+from itertools import islice
+
+__all__ = ['AsyncData']
+
+
+'''
+asyncio access to Data, the sync generators run in worker threads
+
+d = await Data.aload('https://.../mypackage.jsonl')
+async for line in d.line_gen: ...
+async for batch in d.batch_gen(100): ...
+async for chunk in d.chunk_gen(1024**2): ...
+
+Items are the ones of the sync API, in the same order. Remote parts are
+downloaded read_ahead at a time by RemoteReader, local reads run in threads,
+and the next group of items is read while the current one is consumed.
+'''
+
+class AsyncData:
+	line_group = 1024  # lines per thread hop
+
+	def __init__(self, data):
+		self.data = data
+
+	def __getattr__(self, name):  # type, reader, manifest ...
+		return getattr(self.data, name)
+
+	@staticmethod
+	async def _aiter(gen, group=1):
+		take = lambda: list(islice(gen, group))
+		task = asyncio.ensure_future(asyncio.to_thread(take))
+		try:
+			while True:
+				items = await task
+				if not items:
+					break
+				task = asyncio.ensure_future(asyncio.to_thread(take))
+				for item in items:
+					yield item
+		finally:
+			if not task.done():
+				try:
+					await task
+				except Exception:
+					pass
+			if hasattr(gen, 'close'):
+				await asyncio.to_thread(gen.close)
+
+	@property
+	def line_gen(self):
+		return self._aiter(self.data.line_gen, self.line_group)
+
+	def batch_gen(self, *args, **kwargs):  # Data.batch_gen arguments
+		return self._aiter(self.data.batch_gen(*args, **kwargs))
+
+	async def chunk_gen(self, chunk_size=1024):  # created in a thread, it detects the type and loads the manifest
+		gen = await asyncio.to_thread(self.data.chunk_gen, chunk_size)
+		async for chunk in self._aiter(gen):
+			yield chunk
@@ -0,0 +1,218 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+__all__ = ['Cache']
+
+
+'''
+On-disk cache of remote parts, shared between runs and processes
+
+Cache.use('/data/puerml_cache', max_size=50 * 1024**3)   or PUERML_CACHE=/data/puerml_cache
+Data.load('https://...')                                 Jsonl.load, DataFrame.load ... as usual
+
+Package parts listed in a manifest are stored under their checksum and are
+read without a request. Other urls (single files, manifests) are stored with
+their ETag / Last-Modified and revalidated with a conditional request, a 304
+reads the cached copy. Entries are written to a temporary file and renamed
+into place, the least recently used objects are removed above max_size.
+The cache size is counted once and kept up to date by store, the objects
+directory is scanned again only to evict.
+
+PUERML_CACHE is read when RemoteReader first needs the cache, see current.
+
+cache/objects/<md5>-<checksum>     package parts
+cache/objects/<url hash>-<random>  url entries, never rewritten
+cache/urls/<url hash>.json         {url, etag, last_modified, object}
+'''
+
+class Cache:
+	active   = None  # Cache used by RemoteReader, see current
+	max_size = 10 * 1024**3
+	tmp_age  = 3600  # seconds before abandoned temporary files are removed
+
+	_resolved = False  # active was set by use or from the environment
+
+	def __init__(self, location, max_size=None):
+		self.location = location
+		self.max_size = max_size or Cache.max_size
+		self._size    = None  # bytes of objects, counted on the first store
+		self._lock    = threading.RLock()  # size bookkeeping and eviction, stores run on read-ahead threads
+		for name in ('objects', 'urls', 'tmp'):
+			os.makedirs(os.path.join(location, name), exist_ok=True)
+
+	@staticmethod
+	def use(location, max_size=None):  # location=None disables the cache
+		Cache.active    = Cache(location, max_size) if location else None
+		Cache._resolved = True
+		return Cache.active
+
+	@staticmethod
+	def current():  # -> active Cache | None, from the environment unless use was called
+		if not Cache._resolved:
+			Cache.active    = Cache.from_env()
+			Cache._resolved = True
+		return Cache.active
+
+	@staticmethod
+	def from_env():
+		location = os.environ.get('PUERML_CACHE')
+		max_size = os.environ.get('PUERML_CACHE_SIZE')
+		return Cache(location, int(max_size) if max_size else None) if location else None
+
+	######################################################
+
+	def _path(self, *names):
+		return os.path.join(self.location, *names)
+
+	@staticmethod
+	def _url_hash(url):
+		return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+	def _replace(self, data, path):  # atomic json write
+		tmp = self._path('tmp', os.urandom(16).hex())
+		with open(tmp, 'w') as f:
+			json.dump(data, f)
+		os.replace(tmp, path)
+
+	def open(self, name):  # -> binary file of an object | None, marks it as recently used
+		path = self._path('objects', name)
+		try:
+			file = open(path, 'rb')
+		except FileNotFoundError:
+			return None
+		try:
+			os.utime(path)
+		except OSError:
+			pass
+		return file
+
+	def lookup(self, url):  # -> entry, binary file | None, None
+		try:
+			with open(self._path('urls', self._url_hash(url) + '.json')) as f:
+				entry = json.load(f)
+		except (FileNotFoundError, ValueError):
+			return None, None
+		file = self.open(entry['object']) if entry.get('url') == url else None
+		return (entry, file) if file else (None, None)
+
+	@staticmethod
+	def conditional(entry):  # -> conditional request headers of an entry
+		headers = {}
+		if entry.get('etag'):
+			headers['If-None-Match'] = entry['etag']
+		if entry.get('last_modified'):
+			headers['If-Modified-Since'] = entry['last_modified']
+		return headers
+
+	def temp(self):  # -> binary file to download into, see store / discard
+		return open(self._path('tmp', os.urandom(16).hex()), 'w+b')
+
+	def discard(self, file):
+		file.close()
+		try:
+			os.remove(file.name)
+		except FileNotFoundError:
+			pass
+
+	@staticmethod
+	def _digest(file, algorithm):
+		h = hashlib.new(algorithm)
+		file.seek(0)
+		for block in iter(lambda: file.read(1024**2), b''):
+			h.update(block)
+		file.seek(0)
+		return h.hexdigest()
+
+	def store(self, file, url, key=None, etag=None, last_modified=None):  # file stays open and readable
+		file.flush()
+		size = os.fstat(file.fileno()).st_size
+		if key:
+			algorithm, checksum = key.split('-', 1)
+			if self._digest(file, algorithm) != checksum:
+				os.remove(file.name)  # not the content the key promises, kept out of the cache
+				return
+		elif not (etag or last_modified):
+			os.remove(file.name)  # can not be revalidated
+			return
+		with self._lock:
+			if key:
+				path = self._path('objects', key)
+				if os.path.exists(path):
+					size = 0  # same content, already counted
+				os.replace(file.name, path)
+			else:
+				url_hash = self._url_hash(url)
+				name     = f'{url_hash}-{os.urandom(16).hex()}'
+				path     = self._path('urls', url_hash + '.json')
+				try:
+					with open(path) as f:
+						old = json.load(f).get('object')
+				except (FileNotFoundError, ValueError):
+					old = None
+				os.replace(file.name, self._path('objects', name))
+				self._replace({'url': url, 'etag': etag, 'last_modified': last_modified, 'object': name}, path)
+				if old:
+					size -= self._remove(self._path('objects', old))
+			if self._size is None:
+				self._size = self.size  # includes the new object
+				self._clean_tmp()
+			else:
+				self._size += size
+			if self._size > self.max_size:
+				self.evict()
+
+	@staticmethod
+	def _remove(path):  # -> bytes removed
+		try:
+			size = os.path.getsize(path)
+			os.remove(path)
+			return size
+		except FileNotFoundError:
+			return 0
+
+	def evict(self):  # least recently used objects first, down to max_size
+		with self._lock:
+			objects = []
+			for entry in os.scandir(self._path('objects')):
+				try:
+					stat = entry.stat()
+				except FileNotFoundError:
+					continue
+				objects.append((stat.st_mtime, stat.st_size, entry.path))
+			total = sum(size for _, size, _ in objects)
+			for _, size, path in sorted(objects):
+				if total <= self.max_size:
+					break
+				self._remove(path)
+				total -= size
+			self._size = total
+			self._clean_tmp()
+
+	def _clean_tmp(self):
+		now = time.time()
+		for entry in os.scandir(self._path('tmp')):
+			try:
+				if now - entry.stat().st_mtime > self.tmp_age:
+					self._remove(entry.path)
+			except FileNotFoundError:
+				pass
+
+	@property
+	def size(self):
+		size = 0
+		for entry in os.scandir(self._path('objects')):
+			try:
+				size += entry.stat().st_size
+			except FileNotFoundError:
+				pass
+		return size
+
+	def clear(self):
+		with self._lock:
+			for name in ('objects', 'urls'):
+				for entry in os.scandir(self._path(name)):
+					self._remove(entry.path)
+			self._size = 0
@@ -0,0 +1,203 @@
+import os
+import sys
+import json
+import mmap
+import array
+
+from .columns  import Column, BoolColumn, IntColumn, FloatColumn, StrColumn, ObjectColumn
+from .columnar import ColumnarDataFrame
+from .data     import Data
+from .index    import OPS
+from puerml.util import File
+
+__all__ = ['ColumnStore']
+
+
+'''
+Binary columnar package
+
+mytable.pcol/schema.json   header, column types, per chunk row count,
+                           column block offsets and min/max/nulls stats
+mytable.pcol/0             chunk 0: column blocks, 8 byte aligned
+mytable.pcol/1             ...
+
+int   - int64 array
+float - float64 array
+str   - int32 codes array + json list of chunk dictionary values
+object - json list
+
+int/float/str codes are read through mmap without copying for local packages.
+'''
+
+class ColumnStore:
+	extension = '.pcol'
+	schema    = 'schema.json'
+	align     = 8
+	types     = {'int': IntColumn, 'float': FloatColumn, 'bool': BoolColumn}
+
+	@classmethod
+	def is_store(cls, location):
+		if location.lower().rstrip('/').endswith(cls.extension):
+			return True
+		return os.path.isfile(os.path.join(location, cls.schema))
+
+	######################################################
+
+	@staticmethod
+	def _stats(values, nulls):
+		values = [v for v in values if v is not None and v == v]
+		return {
+			'min'   : min(values) if values else None,
+			'max'   : max(values) if values else None,
+			'nulls' : nulls,
+		}
+
+	@classmethod
+	def _encode(cls, column, start, end):  # -> bytes, stats, dictionary values
+		if column.kind in cls.types:
+			block = array.array(column.typecode, column.data[start:end])
+			if column.kind == 'float':
+				return block.tobytes(), cls._stats(block, sum(1 for v in block if v != v)), None
+			return block.tobytes(), cls._stats([min(block), max(block)] if block else [], 0), None
+		if column.kind == 'str':
+			local, codes = {}, array.array('i')
+			for c in column.data[start:end]:
+				codes.append(local.setdefault(c, len(local)))
+			values = [column.values[c] for c in local]
+			empty  = column.lookup.get('')
+			nulls  = codes.count(local[empty]) if empty in local else 0
+			return codes.tobytes(), cls._stats([v for v in values if v != ''], nulls), values
+		values = [column[n] for n in range(start, end)]
+		block  = json.dumps(values, default=str).encode('utf-8')
+		return block, {'min': None, 'max': None, 'nulls': values.count(None)}, None
+
+	@classmethod
+	def save(cls, df, location, max_size=None):
+		if not isinstance(df, ColumnarDataFrame):
+			df = df.to_columnar()
+
+		width      = sum(8 if c.kind in cls.types else 4 for c in df.columns) or 1
+		chunk_rows = max(1, max_size // width) if max_size else max(1, len(df))
+
+		File.rm(location)
+		os.makedirs(location)
+
+		chunks = []
+		for n, start in enumerate(range(0, len(df), chunk_rows) or [0]):
+			end    = min(start + chunk_rows, len(df))
+			chunk  = {'rows': end - start, 'columns': []}
+			offset = 0
+			with open(os.path.join(location, str(n)), 'wb') as f:
+				for column in df.columns:
+					block, stats, values = cls._encode(column, start, end)
+					f.write(block)
+					meta = {'offset': offset, 'size': len(block), 'stats': stats}
+					if values is not None:
+						meta['values'] = values
+					chunk['columns'].append(meta)
+					offset += len(block)
+					padding = -offset % cls.align
+					f.write(b'\0' * padding)
+					offset += padding
+			chunks.append(chunk)
+
+		schema = {
+			'header'    : df.header,
+			'types'     : [c.kind for c in df.columns],
+			'byteorder' : sys.byteorder,
+			'chunks'    : chunks,
+		}
+		with open(os.path.join(location, cls.schema), 'w') as f:
+			json.dump(schema, f)
+
+	######################################################
+
+	@staticmethod
+	def _read_bytes(location, http_headers=None):
+		reader = Data.load(location, headers=http_headers).reader
+		reader.is_binary = True
+		file = next(reader.file_gen())
+		return file.read() if reader.is_local else file.content
+
+	@staticmethod
+	def _may_match(stats, op, value):
+		lo, hi = stats['min'], stats['max']
+		if value is None or value == '':
+			return op != '==' or stats['nulls'] > 0
+		if lo is None:
+			return op not in ('==', '<', '<=', '>', '>=')
+		try:
+			if op == '==' : return lo <= value <= hi
+			if op == '<'  : return lo < value
+			if op == '<=' : return lo <= value
+			if op == '>'  : return hi > value
+			if op == '>=' : return hi >= value
+			if op == 'in' : return any(lo <= v <= hi for v in value)
+		except TypeError:  # values that do not compare cannot skip the chunk
+			pass
+		return True
+
+	@classmethod
+	def _decode(cls, kind, buffer, meta):
+		block = buffer[meta['offset']:meta['offset'] + meta['size']]
+		if kind in cls.types:
+			return cls.types[kind].from_buffer(block)
+		if kind == 'str':
+			return StrColumn.from_codes(block, meta['values'])
+		return ObjectColumn(json.loads(bytes(block).decode('utf-8')))
+
+	@staticmethod
+	def _concat(kind, columns):
+		if len(columns) == 1:
+			return columns[0]
+		if kind == 'str':
+			merged = StrColumn()
+			for column in columns:
+				remap = [merged._code(v) for v in column.values]
+				merged.data.extend(remap[c] for c in column.data)
+			return merged
+		merged = columns[0].copy()
+		for column in columns[1:]:
+			if kind in ColumnStore.types:
+				merged.data.frombytes(memoryview(column.data).cast('B'))  # mapped or own (swapped) data
+			else:
+				merged.data.extend(column.data)
+		return merged
+
+	@classmethod
+	def load(cls, location, cols=None, where=None, http_headers=None):  # where: [(col, op, value)]
+		schema  = json.loads(cls._read_bytes(os.path.join(location, cls.schema), http_headers))
+		header  = schema['header']
+		types   = schema['types']
+		where   = where or []
+		cols    = cols or header
+		positions = {h: n for n, h in enumerate(header)}
+		wanted  = sorted({positions[c] for c in cols} | {positions[c] for c, _, _ in where})
+		swap    = schema.get('byteorder', sys.byteorder) != sys.byteorder
+
+		parts = {n: [] for n in wanted}
+		for n, chunk in enumerate(schema['chunks']):
+			if not all(cls._may_match(chunk['columns'][positions[c]]['stats'], op, v) for c, op, v in where):
+				continue
+			part = os.path.join(location, str(n))
+			if os.path.isfile(part):
+				with open(part, 'rb') as f:
+					buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)) if os.path.getsize(part) else b''
+			else:
+				buffer = memoryview(cls._read_bytes(part, http_headers))
+			for i in wanted:
+				column = cls._decode(types[i], buffer, chunk['columns'][i])
+				if swap and (types[i] in cls.types or types[i] == 'str'):  # str dictionary codes are int32
+					column._own()
+					column.data.byteswap()
+				parts[i].append(column)
+
+		columns = {
+			i: cls._concat(types[i], parts[i]) if parts[i] else Column.infer([])
+			for i in wanted
+		}
+		df = ColumnarDataFrame.from_columns([header[i] for i in wanted], [columns[i] for i in wanted])
+		for col, op, value in where:
+			test = OPS[op]
+			df   = df._take([n for n, v in enumerate(df.columns[df.cols[col]]) if df._test(test, v, value)])
+		return df.alter(cols)
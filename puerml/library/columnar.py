@@ -0,0 +1,314 @@
+from .columns       import Column, StrColumn
+from .data_frame    import DataFrame, DataFrameRow
+from .external_sort import SortKey
+
+__all__ = ['ColumnarRow', 'ColumnarDataFrame']
+
+
+class ColumnarRow:
+	__slots__ = ('df', 'n')
+
+	def __init__(self, df, n):
+		self.df = df
+		self.n  = n
+
+	def __len__(self):
+		return len(self.df.columns)
+
+	def __iter__(self):
+		n = self.n
+		return (column[n] for column in self.df.columns)
+
+	def __getitem__(self, key):
+		if isinstance(key, slice):
+			return [column[self.n] for column in self.df.columns[key]]
+		return self.df.columns[key][self.n]
+
+	def __setitem__(self, key, value):
+		self.df._store(key, self.n, value)
+
+	def __add__(self, other):
+		return list(self) + list(other)
+
+	def __radd__(self, other):
+		return list(other) + list(self)
+
+	def __eq__(self, other):
+		return list(self) == list(other)
+
+	def __repr__(self):
+		return repr(list(self))
+
+	def set(self, col, value):
+		self.df.set(col, self.n, value)
+
+	def get(self, col):
+		col_idx = self.df.cols.get(col, None)
+		return self.df.columns[col_idx][self.n] if col_idx is not None else ''
+
+	def has(self, col):
+		return col in self.df.cols
+
+	def to_dict(self):
+		return {self.df.header[n]: self[n] for n in range(len(self))}
+
+	def copy(self, df):
+		return DataFrameRow([*self], df=df)
+
+############################################################
+
+class _ColumnarRows:
+	def __init__(self, df):
+		self.df = df
+
+	def __len__(self):
+		return len(self.df)
+
+	def __getitem__(self, key):
+		if isinstance(key, slice):
+			return [ColumnarRow(self.df, n) for n in range(len(self.df))[key]]
+		if key < 0:
+			key += len(self.df)
+		if not 0 <= key < len(self.df):
+			raise IndexError('row index out of range')
+		return ColumnarRow(self.df, key)
+
+	def __iter__(self):
+		df = self.df
+		return (ColumnarRow(df, n) for n in range(len(df)))
+
+############################################################
+
+class ColumnarDataFrame(DataFrame):
+	def __init__(self, header=None, rows=None):
+		self.id      = DataFrame._id
+		self.columns = []
+		self.header  = None
+		self.cols    = None
+		self.indices = {}
+		self.n       = 0
+
+		if header:
+			self.set_header(header)
+
+		if rows:
+			for row in rows:
+				self.append(row)
+
+		DataFrame._id += 1
+
+	@staticmethod
+	def from_columns(header, columns):
+		df = ColumnarDataFrame(header)
+		df.columns = [
+			c if isinstance(c, Column) else Column.infer(c)
+			for c in columns
+		]
+		return df
+
+	@staticmethod
+	def from_df(df):
+		columns = [[] for _ in df.header]
+		for row in df.rows:
+			for n in range(len(columns)):
+				columns[n].append(row[n] if n < len(row) else '')
+		return ColumnarDataFrame.from_columns(df.header, columns)
+
+	######################################################
+
+	@property
+	def rows(self):
+		return _ColumnarRows(self)
+
+	def __getitem__(self, key):  # [2:]
+		return self._take(range(len(self))[key])
+
+	def __len__(self):
+		return len(self.columns[0]) if self.columns else 0
+
+	def __iter__(self):
+		return iter(self.rows)
+
+	######################################################
+
+	def _new(self, header=None):
+		return ColumnarDataFrame(header)
+
+	def _index_values(self, col):
+		return self.columns[self.cols[col]]
+
+	def _store(self, col_idx, n, value):
+		column = self.columns[col_idx]
+		try:
+			column[n] = value
+		except TypeError:
+			column = self.columns[col_idx] = column.promote()
+			column[n] = value
+
+	def _append_value(self, col_idx, value):
+		column = self.columns[col_idx]
+		try:
+			column.append(value)
+		except TypeError:
+			if len(column) == 0:
+				column = self.columns[col_idx] = Column.infer([value])
+			else:
+				column = self.columns[col_idx] = column.promote()
+				column.append(value)
+
+	def _take(self, indices):
+		return ColumnarDataFrame.from_columns(
+			self.header,
+			[column.take(indices) for column in self.columns]
+		)
+
+	def _order(self, keys, reverse=False):
+		return sorted(range(len(self)), key=keys.__getitem__, reverse=reverse)
+
+	######################################################
+
+	def set_header(self, header):
+		self.header = header.copy()
+		size = len(self)
+		while len(self.columns) < len(self.header):
+			self.columns.append(StrColumn.constant('', size) if size else StrColumn())
+		del self.columns[len(self.header):]
+		self._update_header_positions()
+		return self
+
+	def append(self, row):
+		for n in range(len(self.columns)):
+			self._append_value(n, row[n] if n < len(row) else '')
+		if self.indices:
+			self._index_append(len(self) - 1)
+		return self
+
+	def _extend(self, columns, size):
+		start = len(self)
+		for n in range(len(self.columns)):
+			values = columns[n] if n < len(columns) else [''] * size
+			if isinstance(self.columns[n], StrColumn):
+				self.columns[n].extend(values)
+			else:
+				for value in values:
+					self._append_value(n, value)
+		if self.indices:
+			for n in range(start, len(self)):
+				self._index_append(n)
+		return self
+
+	def alter(self, cols, copy=False):
+		size    = len(self)
+		columns = []
+		for col in cols:
+			if col in self.cols:
+				column = self.columns[self.cols[col]]
+				columns.append(column.copy() if copy else column)
+			else:
+				columns.append(Column.constant('', size))
+		if copy:
+			return ColumnarDataFrame.from_columns(cols, columns)
+		self.header  = cols.copy()
+		self.columns = columns
+		self._update_header_positions()
+		self._index_rebuild()
+		return self
+
+	def add_col(self, col, value='', after=None):
+		position = len(self.header)
+		if after in self.cols:
+			position = self.cols[after] + 1
+		if callable(value):
+			column = Column.infer([value(row) for row in self.rows])
+		else:
+			column = Column.constant(value, len(self))
+		self.header.insert(position, col)
+		self.columns.insert(position, column)
+		self._update_header_positions()
+		return self
+
+	def remove_col(self, col):
+		col_idx = self.cols[col]
+		del self.header[col_idx]
+		del self.columns[col_idx]
+		self._update_header_positions()
+		self.drop_index(col)
+		return self
+
+	def set(self, col, n, value):
+		col_idx = self.cols.get(col, None)
+		if col_idx is not None:
+			self._index_set(col, n, self.columns[col_idx][n], value)
+			self._store(col_idx, n, value)
+		return self
+
+	def get(self, col, n):
+		col_idx = self.cols.get(col, None)
+		return self.columns[col_idx][n] if col_idx is not None else ''
+
+	def map_col(self, col, f):
+		col_idx = self.cols[col]
+		self.columns[col_idx] = self.columns[col_idx].map(f)
+		self._index_rebuild([col])
+		return self
+
+	def map_cols(self, cols, f):
+		for col in cols:
+			self.map_col(col, f)
+		return self
+
+	def cast(self, col, _type=str):
+		return self.map_col(col, _type)
+
+	def filter(self, f):
+		return self._take([n for n, row in enumerate(self.rows) if f(row, n)])._index_like(self)
+
+	def sort(self, f, cutoff=None):
+		values = [f(row) for row in self.rows]
+		order  = self._order(values)
+		if cutoff is not None:
+			order = [n for n in order if values[n] > cutoff]
+		self.columns = [column.take(order) for column in self.columns]
+		self._index_rebuild()
+
+	def sort_by(self, col, asc=True):
+		cols  = [col] if isinstance(col, str) else col
+		order = list(range(len(self)))
+		for col, asc in reversed(list(zip(cols, SortKey.ascending(cols, asc)))):
+			keys = self.columns[self.cols[col]].sort_keys()
+			order.sort(key=keys.__getitem__, reverse=not asc)
+		self.columns = [column.take(order) for column in self.columns]
+		self._index_rebuild()
+
+	def find(self, col, value):
+		if col in self.indices:
+			return super().find(col, value)
+		col_idx = self.cols.get(col, None)
+		if col_idx is not None:
+			for n, v in enumerate(self.columns[col_idx]):
+				if v == value:
+					return ColumnarRow(self, n), n
+		return None, None
+
+	def copy(self):
+		return ColumnarDataFrame.from_columns(
+			self.header,
+			[column.copy() for column in self.columns]
+		)._index_like(self)
+
+	def to_list(self, col, _type=str):
+		column = self.columns[self.cols[col]]
+		if column.kind == _type.__name__:
+			return column.to_list()
+		return [_type(v) for v in column]
+
+	def to_unique_list(self, col):
+		if col in self.indices:
+			return self.indices[col].values()
+		return list(set(self.columns[self.cols[col]]))
+
+	def to_numpy(self, col):
+		return self.columns[self.cols[col]].to_numpy()
+
+	def to_rows(self):
+		return DataFrame(self.header, [list(row) for row in self.rows])
@@ -0,0 +1,272 @@
+import array
+
+__all__ = ['Column', 'BoolColumn', 'IntColumn', 'FloatColumn', 'StrColumn', 'ObjectColumn']
+
+
+class Column:
+	kind = None
+
+	def __init__(self, values=None):
+		self.data = self._empty()
+		if values:
+			self.extend(values)
+
+	def _empty(self):
+		return []
+
+	def _check(self, value):
+		pass
+
+	def _own(self):
+		pass
+
+	######################################################
+
+	@staticmethod
+	def infer(values):
+		values = values if isinstance(values, list) else list(values)
+		if not values:
+			return StrColumn()
+		for cls in (BoolColumn, IntColumn, FloatColumn, StrColumn):
+			if all(cls.accepts(v) for v in values):
+				return cls(values)
+		return ObjectColumn(values)
+
+	@staticmethod
+	def constant(value, n):
+		column = Column.infer([value])
+		column.data *= n
+		return column
+
+	@staticmethod
+	def accepts(value):
+		return True
+
+	######################################################
+
+	def __len__(self):
+		return len(self.data)
+
+	def __getitem__(self, n):
+		return self.data[n]
+
+	def __setitem__(self, n, value):
+		self._check(value)
+		self._own()
+		self.data[n] = value
+
+	def __iter__(self):
+		return iter(self.data)
+
+	def append(self, value):
+		self._check(value)
+		self._own()
+		self.data.append(value)
+
+	def extend(self, values):
+		for value in values:
+			self.append(value)
+
+	def take(self, indices):
+		column      = self.__class__()
+		column.data = self._empty()
+		column.data.extend(self.data[n] for n in indices)
+		return column
+
+	def copy(self):
+		return self.take(range(len(self)))
+
+	def promote(self):
+		return ObjectColumn(self.to_list())
+
+	def map(self, f):
+		return Column.infer([f(v) for v in self.data])
+
+	def sort_keys(self):
+		return self.data
+
+	def to_list(self):
+		return list(self.data)
+
+	def to_numpy(self):
+		import numpy as np
+		return np.array(self.to_list(), dtype=object)
+
+############################################################
+
+class _TypedColumn(Column):
+	typecode = None
+	types    = ()
+
+	def _empty(self):
+		return array.array(self.typecode)
+
+	def _check(self, value):
+		if type(value) not in self.types:
+			raise TypeError(f'{self.kind} column can not store "{type(value).__name__}"')
+
+	def _own(self):  # copy on write for columns mapped from a read-only buffer
+		if isinstance(self.data, memoryview):
+			data = array.array(self.typecode)
+			data.frombytes(self.data.cast('B'))
+			self.data = data
+
+	@classmethod
+	def accepts(cls, value):
+		return type(value) in cls.types
+
+	@classmethod
+	def from_buffer(cls, buffer):
+		column      = cls()
+		column.data = memoryview(buffer).cast('B').cast(cls.typecode)
+		return column
+
+	def append(self, value):
+		self._check(value)
+		self._own()
+		try:
+			self.data.append(value)
+		except OverflowError as e:
+			raise TypeError(str(e))
+
+	def to_numpy(self):
+		import numpy as np
+		return np.frombuffer(self.data, dtype=self.typecode)
+
+class BoolColumn(_TypedColumn):  # one byte per value
+	kind     = 'bool'
+	typecode = 'B'
+	types    = (bool,)
+
+	def __getitem__(self, n):
+		return bool(self.data[n])
+
+	def __iter__(self):
+		return map(bool, self.data)
+
+	def map(self, f):
+		return Column.infer([f(v) for v in self])
+
+	def to_list(self):
+		return list(self)
+
+	def to_numpy(self):
+		return super().to_numpy().astype(bool)
+
+class IntColumn(_TypedColumn):
+	kind     = 'int'
+	typecode = 'q'
+	types    = (int,)
+
+	@staticmethod
+	def accepts(value):  # int64, larger ints are stored by an ObjectColumn
+		return type(value) is int and -2**63 <= value < 2**63
+
+class FloatColumn(_TypedColumn):
+	kind     = 'float'
+	typecode = 'd'
+	types    = (float,)
+
+############################################################
+
+# Dictionary encoded: every distinct value is stored once in `values`,
+# rows keep an int32 code pointing into it.
+class StrColumn(Column):
+	kind = 'str'
+
+	def __init__(self, values=None):
+		self.values = []
+		self.lookup = {}
+		super().__init__(values)
+
+	def _empty(self):
+		return array.array('i')
+
+	def _check(self, value):
+		if type(value) is not str:
+			raise TypeError(f'str column can not store "{type(value).__name__}"')
+
+	def _own(self):
+		if isinstance(self.data, memoryview):
+			data = array.array('i')
+			data.frombytes(self.data.cast('B'))
+			self.data = data
+
+	def _code(self, value):
+		code = self.lookup.get(value)
+		if code is None:
+			code = self.lookup[value] = len(self.values)
+			self.values.append(value)
+		return code
+
+	@staticmethod
+	def accepts(value):
+		return type(value) is str
+
+	@staticmethod
+	def from_codes(codes, values):
+		column        = StrColumn()
+		column.data   = memoryview(codes).cast('B').cast('i') if not isinstance(codes, array.array) else codes
+		column.values = values
+		column.lookup = {v: c for c, v in enumerate(values)}
+		return column
+
+	######################################################
+
+	def __getitem__(self, n):
+		return self.values[self.data[n]]
+
+	def __setitem__(self, n, value):
+		self._check(value)
+		self._own()
+		self.data[n] = self._code(value)
+
+	def __iter__(self):
+		values = self.values
+		return (values[c] for c in self.data)
+
+	def append(self, value):
+		self._check(value)
+		self._own()
+		self.data.append(self._code(value))
+
+	def extend(self, values):
+		self._own()
+		code, data = self._code, self.data
+		for value in values:
+			self._check(value)
+			data.append(code(value))
+
+	def take(self, indices):
+		column        = StrColumn()
+		column.values = self.values.copy()
+		column.lookup = self.lookup.copy()
+		data          = self.data
+		column.data.extend(data[n] for n in indices)
+		return column
+
+	def map(self, f):
+		used    = set(self.data)
+		results = {c: f(self.values[c]) for c in used}
+		if all(type(v) is str for v in results.values()):
+			column = StrColumn()
+			remap  = {c: column._code(v) for c, v in results.items()}
+			column.data.extend(remap[c] for c in self.data)
+			return column
+		return Column.infer([results[c] for c in self.data])
+
+	def sort_keys(self):
+		ranks = {c: r for r, c in enumerate(sorted(range(len(self.values)), key=self.values.__getitem__))}
+		return [ranks[c] for c in self.data]
+
+	def to_list(self):
+		values = self.values
+		return [values[c] for c in self.data]
+
+############################################################
+
+class ObjectColumn(Column):
+	kind = 'object'
+
+	def promote(self):
+		return self
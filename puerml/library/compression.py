@@ -0,0 +1,95 @@
+import os
+import zlib
+import importlib
+
+__all__ = ['Compression']
+
+
+'''
+Streaming per-file compression, picked by name or by location extension
+
+Data.set(lines).save('mypackage.jsonl.gz', max_size)
+Data.set(lines).save('mypackage.jsonl', max_size, compression='zst')
+Data.set(lines).save('mypackage.jsonl.gz', max_size, size='compressed')
+Data.load('mypackage.jsonl.gz')
+
+Every package part is a complete compressed stream under its usual numbered
+name, the manifest records the compression and max_size limits the
+uncompressed size of a part, or about its compressed size with
+size='compressed'. Extensions only select compression for text,
+binary data is compressed when compression is given explicitly.
+
+gz, bz2, xz - standard library
+zst         - optional "zstandard" package
+lz4         - optional "lz4" package
+'''
+
+class Compression:
+	modules = {'gz': 'gzip', 'bz2': 'bz2', 'xz': 'lzma', 'zst': 'zstandard', 'lz4': 'lz4.frame'}
+	aliases = {'gzip': 'gz', 'lzma': 'xz', 'zstd': 'zst'}
+
+	def __init__(self, name):
+		name = self.aliases.get(name.lower(), name.lower())
+		if name not in self.modules:
+			raise Exception(f'Unsupported compression "{name}", expected one of {list(self.modules)}')
+		try:
+			self.module = importlib.import_module(self.modules[name])
+		except ImportError:
+			raise Exception(f'Compression "{name}" requires the "{self.modules[name].split(".")[0]}" package')
+		self.name = name
+
+	@staticmethod
+	def extension(location):  # -> compression name of the location extension or None
+		_, ext = os.path.splitext(location.rstrip('/').lower())
+		name   = Compression.aliases.get(ext[1:], ext[1:])
+		return name if name in Compression.modules else None
+
+	@staticmethod
+	def strip(location):  # location without the compression extension
+		if Compression.extension(location) is None:
+			return location
+		return os.path.splitext(location.rstrip('/'))[0]
+
+	@staticmethod
+	def from_location(location):  # -> Compression | None
+		name = Compression.extension(location)
+		return Compression(name) if name else None
+
+	######################################################
+
+	def compress(self, data):
+		if self.name == 'zst':
+			return self.module.ZstdCompressor().compress(data)
+		return self.module.compress(data)
+
+	def compressor(self):  # -> incremental compressor, compress(data) and flush() return the next stored bytes
+		if self.name == 'gz':
+			return zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip stream, as gzip.compress
+		if self.name == 'bz2':
+			return self.module.BZ2Compressor()
+		if self.name == 'xz':
+			return self.module.LZMACompressor()
+		if self.name == 'zst':
+			return self.module.ZstdCompressor().compressobj()
+		return _FrameCompressor(self.module)
+
+	def open(self, file, mode='rb', encoding='utf-8'):  # file: path or binary file object
+		kwargs = {} if 'b' in mode else {'encoding': encoding}
+		if self.name == 'zst' and not isinstance(file, str):
+			kwargs['closefd'] = False
+		return self.module.open(file, mode, **kwargs)
+
+############################################################
+
+class _FrameCompressor:  # lz4.frame compressor with the compress / flush interface of the others
+	def __init__(self, module):
+		self.compressor = module.LZ4FrameCompressor()
+		self.header     = self.compressor.begin()
+
+	def compress(self, data):
+		header, self.header = self.header, b''
+		return header + self.compressor.compress(data)
+
+	def flush(self):
+		header, self.header = self.header, b''
+		return header + self.compressor.flush()
@@ -0,0 +1,67 @@
+import re
+import csv
+
+__all__ = ['CsvCodec']
+
+
+'''
+RFC 4180 csv/tsv codec working on a stream of lines.
+
+Lines without quotes are split directly, quoted records (which may span
+several lines) go through csv.reader. As in csv.reader a quote opens a
+field only at the start of the field, a record continues on the next line
+while such a field is open. On write a row is joined directly
+unless one of its cells needs quoting.
+'''
+
+class CsvCodec:
+	def __init__(self, delimiter=','):
+		self.delimiter = delimiter
+		d              = re.escape(delimiter)
+		field          = f'(?:"(?:[^"]|"")*+"[^{d}\\n]*+|[^"{d}\\n][^{d}\\n]*+|)'
+		self._closed   = re.compile(f'{field}(?:{d}{field})*+')  # fullmatch: no quoted field left open
+
+	@staticmethod
+	def _str(value):
+		if value is None:
+			return ''
+		return value if isinstance(value, str) else str(value)
+
+	def _quote(self, cell):
+		if '"' in cell or self.delimiter in cell or '\n' in cell or '\r' in cell:
+			return '"' + cell.replace('"', '""') + '"'
+		return cell
+
+	######################################################
+
+	def decode(self, text):
+		return next(csv.reader([text], delimiter=self.delimiter), [])
+
+	def decode_lines(self, lines):
+		delimiter = self.delimiter
+		record    = None
+		for line in lines:
+			if record is None:
+				if '"' not in line:
+					yield line.split(delimiter)
+					continue
+				record = line
+			else:
+				record += '\n' + line
+			if self._closed.fullmatch(record):
+				yield self.decode(record)
+				record = None
+		if record is not None:
+			yield self.decode(record)
+
+	def encode(self, row):
+		delimiter = self.delimiter
+		cells     = [self._str(cell) for cell in row]
+		line      = delimiter.join(cells)
+		if line.count(delimiter) == len(cells) - 1 and '"' not in line and '\n' not in line and '\r' not in line:
+			return line
+		return delimiter.join(self._quote(cell) for cell in cells)
+
+	def encode_rows(self, rows):
+		for row in rows:
+			yield self.encode(row)
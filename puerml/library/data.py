@@ -1,10 +1,16 @@
 import os
 import io
-import magic
-import requests
-import zipfile
+import re
+import tempfile
 
-from puerml.util import File
+from functools import partial
+
+from .archive     import Archive, ChunkStream
+from .compression import Compression
+from .line_index  import LineIndex
+from .manifest    import Manifest
+from .remote      import RemoteReader
+from puerml.util  import File, Pool
 
 '''
 Single file
@@ -17,41 +23,202 @@ mypackage.jsonl/1
 Load - Save
 Data.load('mypackage.jsonl')
 Data.save('mypackage.jsonl', max_size)
+
+Compressed (see compression.py)
+Data.load('mypackage.jsonl.gz')
+Data.save('mypackage.jsonl.gz', max_size)
+
+Async (see async_data.py)
+d = await Data.aload('mypackage.jsonl')
 '''
 
 ############################################################
 
 class DataReader:
+	text_types        = {'application/json', 'application/x-ndjson', 'application/csv'}
+	text_extensions   = {'txt', 'csv', 'tsv', 'json', 'jsonl', 'ndjson', 'md', 'xml', 'html', 'yaml', 'yml', 'log'}
+	binary_extensions = {'bin', 'zip', 'tar', 'npy', 'npz', 'pkl', 'pt', 'parquet', 'png', 'jpg', 'jpeg', 'gif', 'pdf'}
+	block_size        = 1024**2
+
+	_magic    = None  # magic.Magic, created on first use
+	_controls = bytes(sorted(set(range(32)) - set(b'\t\n\r\x0c\x1b')))
+
+	# whitespace str.strip() removes, as utf-8 and as reversed utf-8
+	_ws       = rb'[\t\x0b\x0c\x1c-\x1f ]|\xc2[\x85\xa0]|\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80'
+	_ws_rev   = rb'[\t\x0b\x0c\x1c-\x1f ]|[\x85\xa0]\xc2|\x80\x9a\xe1|[\x80-\x8a\xa8\xa9\xaf]\x80\xe2|\x9f\x81\xe2|\x80\x80\xe3'
+	_lead_ws  = re.compile(rb'\n(?:' + _ws + rb')')
+	_trail_ws = re.compile(rb'\n(?:' + _ws_rev + rb')')  # searched in reversed lines
+	_newlines = re.compile(rb'\n*')
+
 	def __init__(self):
 		self._data     = None
+		self._lines    = None
 		self.is_binary = None
 		self.is_local  = False
 		self.is_zip    = False
 		self.location  = None
 		self.headers   = None
+		self.manifest  = None
+		self.verify    = False
+		self.progress  = None  # f(parts_done, parts_total)
+
+		self.compression      = None  # Compression
+		self._compression_ext = False # compression guessed from the extension
+		self._manifest_loaded = False
+
+	@staticmethod
+	def _sniff(head):  # -> is_binary, None when it takes libmagic to tell
+		if not head:
+			return None
+		if b'\x00' in head:
+			return True
+		try:
+			head.decode('utf-8')
+		except UnicodeDecodeError as e:
+			if e.reason != 'unexpected end of data' or e.start < len(head) - 3:
+				return None
+		if len(head) - len(head.translate(None, DataReader._controls)) > len(head) // 100:
+			return None
+		return False
+
+	@classmethod
+	def _libmagic(cls, head):  # -> is_binary
+		if cls._magic is None:
+			import magic
+			cls._magic = magic.Magic(mime=True)
+		file_type = cls._magic.from_buffer(head)
+		return not file_type.startswith('text/') and file_type not in cls.text_types
 
 	def _test_content(self, content):
-		mime           = magic.Magic(mime=True)
-		file_type      = mime.from_buffer(content)
-		self.is_binary = not file_type.startswith('text/')
+		is_binary      = self._sniff(content)
+		self.is_binary = self._libmagic(content) if is_binary is None else is_binary
+
+	def _from_extension(self):  # -> is_binary of a known location extension, None otherwise
+		if self.location is None:
+			return None
+		ext = os.path.splitext(Compression.strip(self.location).lower())[1][1:]
+		if ext in self.text_extensions:
+			return False
+		if ext in self.binary_extensions:
+			return True
+		return None
+
+	def _probe(self, source):  # path or binary file object
+		if not self._compression_ext:  # a guessed compression is confirmed by reading
+			self.is_binary = self._from_extension()
+			if self.is_binary is not None:
+				return
+
+		head = None
+		if self.compression:
+			try:
+				f    = self.compression.open(source, 'rb')
+				head = f.read(1024)
+				f.close()
+			except Exception:
+				if not self._compression_ext:
+					raise
+				self.compression = None
+		if head is None:
+			if isinstance(source, str):
+				with open(source, 'rb') as f:
+					head = f.read(1024)
+			else:
+				head = source.read(1024)
+		if not isinstance(source, str):
+			source.seek(0)
+
+		self._test_content(head)
+		if self.is_binary and self._compression_ext:
+			self.compression = None
+
+	def _detect(self):  # is_binary (and compression) of a location before reading it
+		if self.is_binary is None and self.location is not None and self._load_manifest() is None:
+			if self.is_local:
+				first = os.path.join(self.location, '0')
+				path  = first if os.path.isfile(first) else self.location
+				if os.path.isfile(path):
+					self._probe(path)
+			elif self._compression_ext or self._from_extension() is None:
+				head = self._remote_head()
+				if head:
+					self._probe(io.BytesIO(head))
+			else:
+				self.is_binary = self._from_extension()
+		return self.is_binary
+
+	def _remote_head(self, size=4096):  # -> first bytes of a remote package or file, compressed ones decompress to 1024 bytes
+		remote = RemoteReader(self.headers)
+		for url in (os.path.join(self.location, '0'), self.location):
+			try:
+				return remote.fetch_range(url, 0, size)
+			except Exception:
+				continue
+		return b''
 
 	def _read_remote(self, location):
-		response = requests.get(location, headers=self.headers, stream=True)
-		if response.status_code == 200:
-			if self.is_binary is None:
-				self._test_content(response.content)
+		part = RemoteReader(self.headers).fetch(location)
+		if part is not None and self.is_binary is None:
+			self._probe(part.file)
+		return part
 
-			return response
-		return None
+	def _remote_file_gen(self):
+		for part in RemoteReader(self.headers).part_gen(self.location):
+			if self.is_binary is None:
+				self._probe(part.file)
+			yield part
+
+	def _remote_stream(self, part, mode):  # decompressing file object over a remote part
+		part.file.seek(0)
+		return self.compression.open(part.file, mode)
+
+	def _load_manifest(self):
+		if not self._manifest_loaded:
+			self._manifest_loaded = True
+			self.manifest = Manifest.load(self.location, self.headers)
+			if self.manifest is not None:
+				if self.is_binary is None:
+					self.is_binary = self.manifest.binary
+				if not self.compression or self._compression_ext:
+					self.compression      = Compression(self.manifest.compression) if self.manifest.compression else None
+					self._compression_ext = False
+		return self.manifest
+
+	def _manifest_file_gen(self, start):
+		manifest = self.manifest
+		total    = len(manifest.parts)
+		if self.is_local:
+			for n in range(start, total):
+				loc = os.path.join(self.location, str(n))
+				if not os.path.isfile(loc):
+					raise FileNotFoundError(f'Package part "{loc}" listed in the manifest is missing')
+				manifest.check_size(n, os.path.getsize(loc))
+				if self.verify:
+					with open(loc, 'rb') as f:
+						manifest.verify(n, f.read())
+				file = self._read_local(loc)
+				yield file
+				file.close()
+				if self.progress: self.progress(n + 1, total)
+		else:
+			parts = RemoteReader(self.headers).part_gen(self.location, start, total, manifest.keys())
+			for n, part in enumerate(parts, start):
+				if self.verify:
+					manifest.verify(n, part.content)
+				else:
+					manifest.check_size(n, part.size)
+				yield part
+				if self.progress: self.progress(n + 1, total)
 
 	def _read_local(self, location):
 		try:
 			if os.path.exists(location):
 				if self.is_binary is None:
-					with open(location, 'rb') as f:
-						self._test_content(f.read(1024))
+					self._probe(location)
 
 				mode = 'rb' if self.is_binary else 'r'
+				if self.compression:
+					return self.compression.open(location, mode if self.is_binary else 'rt')
 				return open(location, mode)
 		except Exception as e:
 			print(f'Failed to read file "{location}": {e}')
@@ -62,19 +229,32 @@ class DataReader:
 			return self._read_local(location)
 		return self._read_remote(location)
 
-	def _chunk_binary_gen(self, max_size):
+	@staticmethod
+	def _fill(f, view):  # -> bytes read into view, short only at the end of f
+		size = 0
+		while size < len(view):
+			n = f.readinto(view[size:])
+			if not n:
+				break
+			size += n
+		return size
+
+	def _chunk_binary_gen(self, max_size, reuse=False):  # reuse: yield views of one buffer
+		buffer = memoryview(bytearray(max_size)) if reuse else None
 		for f in self.file_gen():
-			if self.is_local:
-				while True:
+			if not self.is_local and self.compression:
+				f = self._remote_stream(f, 'rb')
+			while True:
+				if reuse:
+					size = self._fill(f, buffer)
+					b    = buffer[:size]
+				else:
 					b = f.read(max_size)
-					if not b:
-						break
-					yield b
-			else:
-				for b in f.iter_content(chunk_size=max_size):
-					yield b
+				if not b:
+					break
+				yield b
 
-	def _chunk_text_gen(self, max_size):
+	def _chunk_lines_gen(self, max_size):
 		b, b_size, n = [], 0, 0
 		for l in self.line_gen():
 			l_size = len(l.encode('utf-8'))
@@ -87,11 +267,120 @@ class DataReader:
 		if b_size > 0:
 			yield '\n'.join(b)
 
+	@classmethod
+	def _is_stripped(cls, block):  # whole lines that str.strip() leaves as they are
+		block = b'\n' + block
+		return b'\r' not in block and not cls._lead_ws.search(block) and not cls._trail_ws.search(block[::-1])
+
+	@staticmethod
+	def _strip(block, universal):  # decoded stripped lines, universal: text mode newlines
+		text = block.decode('utf-8')
+		if universal:
+			text = text.replace('\r\n', '\n').replace('\r', '\n')
+		return '\n'.join(line.strip() for line in text.split('\n')[:-1]).encode('utf-8') + b'\n'
+
+	def _text_block_gen(self):  # raw bytes of every text file, each file ending with a newline
+		for f in self.file_gen():
+			if isinstance(f, io.TextIOWrapper):
+				f = f.buffer
+			elif not self.is_local and self.compression:
+				f = self._remote_stream(f, 'rb')
+			encode = isinstance(f, io.TextIOBase)
+			last   = b'\n'
+			while True:
+				block = f.read(self.block_size)
+				if not block:
+					break
+				block = block.encode('utf-8') if encode else block
+				last  = block[-1:]
+				yield block
+			if last != b'\n':
+				yield b'\n'
+
+	@staticmethod
+	def _cut(buffer, start, size, max_size, eof, state):  # -> newline ending the chunk at start, None if more data is needed
+		if size - start <= max_size and not eof:
+			return None
+		# window: bytes from start holding max_size line bytes, newlines do not count
+		# state: [position, newlines in buffer[start:position]] kept between calls
+		counted, n = state
+		window     = max_size + n
+		while True:
+			stop = min(start + window, size)
+			if stop > counted:
+				n      += buffer.count(b'\n', counted, stop)
+				counted = stop
+			if max_size + n == window:
+				break
+			window = max_size + n
+		state[:] = counted, n
+		limit = start + window
+		if limit >= size:
+			return size - 1 if eof else None
+		end = buffer.rfind(b'\n', start, limit + 1)
+		if end == -1:
+			# a single line over max_size is a chunk by itself
+			return buffer.find(b'\n', limit, size)
+		if end == limit:
+			# empty lines right after the limit still fit
+			end = DataReader._newlines.match(buffer, limit, size).end()
+			if end == size and not eof:
+				return None
+			end -= 1
+		return end
+
+	def _chunk_text_gen(self, max_size):  # same parts as _chunk_lines_gen, lines are decoded only to strip them
+		if self._lines is not None:
+			yield from self._chunk_lines_gen(max_size)
+			return
+		universal = not isinstance(self._data, io.StringIO)
+		blocks    = self._text_block_gen()
+		buffer    = bytearray()
+		clean     = 0  # buffer[:clean] holds whole stripped lines
+		state     = [0, 0]
+		eof       = False
+		while not eof:
+			block = next(blocks, None)
+			if block is None:
+				eof = True
+			else:
+				buffer += block
+				end     = buffer.rfind(b'\n', clean) + 1
+				if end > clean:
+					if not self._is_stripped(buffer[clean:end]):
+						lines             = self._strip(buffer[clean:end], universal)
+						buffer[clean:end] = lines
+						end               = clean + len(lines)
+					clean = end
+
+			start = 0
+			while start < clean:
+				end = self._cut(buffer, start, clean, max_size, eof, state)
+				if end is None:
+					break
+				# a last part of empty lines only is dropped, as _chunk_lines_gen does
+				if not eof or end != clean - 1 or buffer.count(b'\n', start, clean) != clean - start:
+					yield bytes(memoryview(buffer)[start:end])
+				start = end + 1
+				state = [start, 0]
+			if start:
+				del buffer[:start]
+				clean   -= start
+				state[0] -= start
+
 	##########################################
 
-	def file_gen(self):
-		if self._data:
+	def file_gen(self, start=0):  # start: first package part
+		if self._lines is not None:
+			yield self._lines
+		elif self._data:
 			yield self._data
+		elif self._load_manifest() is not None:
+			yield from self._manifest_file_gen(start)
+		elif start:
+			raise Exception(f'Package "{self.location}" has no manifest, can not start at part {start}')
+		elif not self.is_local:
+			yield from self._remote_file_gen()
 		else:
 			n = 0
 			urls = []
@@ -117,25 +406,40 @@ class DataReader:
 				else:
 					break
 
-	def line_gen(self):
+	def line_gen(self, strip=True, start=0):  # start: first package part
 		if self.is_binary:
 			raise Exception('Can not iterate lines of binary file')
-		for file in self.file_gen():
-			iterator = file if self.is_local else file.iter_lines(decode_unicode=True)
+		if self._lines is not None:
+			yield from self._lines
+			return
+		for file in self.file_gen(start):
+			if self.is_local:
+				iterator = file
+			elif self.compression:
+				iterator = self._remote_stream(file, 'rt')
+			else:
+				iterator = file.iter_lines(decode_unicode=True)
 			for line in iterator:
-				yield line.strip()
+				yield line.strip() if strip else line.rstrip('\r\n')
 
-	def chunk_gen(self, max_size=1024**4):
-		if self.is_binary:
-			return self._chunk_binary_gen(max_size)
+	def chunk_gen(self, max_size=1024**4, reuse=False):
+		if self._detect():
+			return self._chunk_binary_gen(max_size, reuse)
 		return self._chunk_text_gen(max_size)
 
 	@staticmethod
-	def load(location, headers=None):
+	def load(location, headers=None, verify=False, progress=None, compression=None):
 		reader = DataReader()
 		reader.location = location
 		reader.headers  = headers
+		reader.verify   = verify
+		reader.progress = progress
 		reader.is_local = not location.startswith('http')
+		if compression:
+			reader.compression      = Compression(compression)
+		else:
+			reader.compression      = Compression.from_location(location)
+			reader._compression_ext = reader.compression is not None
 		return reader
 
 	@staticmethod
@@ -150,30 +454,131 @@ class DataReader:
 			reader._data     = io.StringIO(data)
 			reader.is_binary = False
 			return reader
-		raise Exception(f'Expected "str" or "bytes", got "{type(data)}"')
+		elif hasattr(data, '__iter__'):
+			reader._lines    = iter(data)
+			reader.is_binary = False
+			return reader
+		raise Exception(f'Expected "str", "bytes" or lines iterable, got "{type(data)}"')
 
 ############################################################
 ############################################################
 
 class DataWriter:
-	def __init__(self, reader):
-		self.reader = reader
+	def __init__(self, reader, compression=None):
+		self.reader      = reader
+		self.compression = compression
+
+	def _compression(self, location):  # explicit, or by extension for text
+		if self.compression:
+			return Compression(self.compression)
+		if self.reader.is_binary:
+			return None
+		return Compression.from_location(location)
+
+	def _open(self, location, compression, binary=False):  # binary: bytes of a text source
+		binary = binary or self.reader.is_binary
+		if compression:
+			return compression.open(location, 'wb' if binary else 'wt')
+		return open(location, 'wb' if binary else 'w')
 
 	def write_single_file(self, location):
 		File.rm(location)
-		with open(location, 'wb' if self.reader.is_binary else 'w') as f:
-			f.write(next(self.reader.file_gen()).read())
-
-	def write_package(self, location, max_size):
+		if self.reader._lines is not None:
+			with self._open(location, self._compression(location)) as f:
+				for n, line in enumerate(self.reader.line_gen()):
+					f.write('\n' + line if n else line)
+		else:
+			sources = self.reader.file_gen()
+			source  = self._source(next(sources))
+			binary  = not isinstance(source, io.TextIOBase)  # remote parts are bytes, text or not
+			with self._open(location, self._compression(location), binary) as f:
+				while source is not None:
+					File.copy(source, f)
+					source = next(sources, None)
+					if source is not None:
+						source = self._source(source)
+						if not self.reader.is_binary:
+							f.write(b'\n' if binary else '\n')  # text parts end without a line break
+
+	def _source(self, part):
+		if not self.reader.is_local and self.reader.compression:
+			return self.reader._remote_stream(part, 'rb')
+		return part
+
+	def _compressed_parts(self, chunks, location, max_size):  # -> (part, stored part) of about max_size stored bytes
+		sep, compression, compressor = None, None, None
+		empty, ratio = 0, 1.0  # stored size of an empty part, stored / uncompressed size of the last part
+		part, stored, raw, size = [], [], 0, 0  # raw bytes in, stored bytes out so far
+		for chunk in chunks:
+			data = chunk.encode('utf-8') if isinstance(chunk, str) else bytes(chunk)
+			if sep is None:
+				sep         = b'' if self.reader.is_binary else b'\n'
+				compression = self._compression(location)
+				if compression:
+					empty = len(compression.compressor().flush())
+					ratio = len(compression.compress(data)) / max(len(data), 1)
+			piece = sep + data if part else data
+			# the compressor holds back some of its input, the stored size so far or the
+			# size expected from the ratio of the last part, whichever is larger
+			if part and empty + max(size, (raw + len(piece)) * ratio) > max_size:
+				if compressor:
+					stored.append(compressor.flush())
+					size += len(stored[-1])
+					ratio = max(size - empty, 1) / raw
+				yield sep.join(part), b''.join(stored) if compressor else None
+				part, stored, raw, size = [], [], 0, 0
+				piece = data
+			if compression:
+				if not part:
+					compressor = compression.compressor()
+				stored.append(compressor.compress(piece))
+				size += len(stored[-1])
+			part.append(data)
+			raw += len(piece)
+		if part:
+			if compressor:
+				stored.append(compressor.flush())
+			yield sep.join(part), b''.join(stored) if compressor else None
+
+	def write_package(self, location, max_size, size='uncompressed'):
+		if size not in ('uncompressed', 'compressed'):
+			raise Exception(f'Unsupported size "{size}", expected "uncompressed" or "compressed"')
 		File.rm(location)
 		os.makedirs(location)
 		n = 0
-		for chunk in self.reader.chunk_gen(max_size):
-			loc  = os.path.join(location, str(n))
-			mode = 'wb' if self.reader.is_binary else 'w'
-			with open(loc, mode) as f:
-				f.write(chunk)
+		manifest    = Manifest()
+		compression = None
+		if size == 'compressed':  # compressed once, while the part is built
+			parts = self._compressed_parts(self.reader.chunk_gen(max(max_size // 4, 1), reuse=True), location, max_size)
+		else:
+			parts = ((chunk, None) for chunk in self.reader.chunk_gen(max_size, reuse=True))
+		for chunk, stored in parts:
+			if n == 0:
+				compression          = self._compression(location)
+				manifest.binary      = bool(self.reader.is_binary)
+				manifest.compression = compression.name if compression else None
+			loc = os.path.join(location, str(n))
+			if compression:
+				data   = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+				stored = compression.compress(data) if stored is None else stored
+				with open(loc, 'wb') as f:
+					f.write(stored)
+				manifest.add(data, stored)
+			else:
+				with open(loc, 'w' if isinstance(chunk, str) else 'wb') as f:
+					f.write(chunk)
+				manifest.add(chunk)
 			n += 1
+		manifest.save(location)
+
+############################################################
+
+def _prepare_batch(preprocess, batch_preprocess, size, fill, batch):
+	if preprocess:
+		batch = [preprocess(line) for line in batch]
+	if len(batch) < size:
+		batch.extend([fill] * (size - len(batch)))
+	return batch_preprocess(batch) if batch_preprocess else batch
 
 ############################################################
 ############################################################
@@ -183,6 +588,8 @@ class Data:
 		self.reader = reader
 		self.type   = None
 
+		self._line_index = None
+
 	@staticmethod
 	def set(data, file_type=None):
 		d = Data(DataReader.set(data))
@@ -191,50 +598,55 @@ class Data:
 		return d
 
 	@staticmethod
-	def load(location, headers=None):
-		_, file_type = os.path.splitext(location.lower())
-		d = Data(DataReader.load(location, headers))
+	def load(location, headers=None, verify=False, progress=None, compression=None):
+		_, file_type = os.path.splitext(Compression.strip(location).lower())
+		d = Data(DataReader.load(location, headers, verify, progress, compression))
 		d.type = file_type.replace('.', '')
 		if location.endswith('.zip'):
 			d.reader.is_zip = True
 		return d
 
-	def save(self, location, max_size=None):
+	@staticmethod
+	async def aload(location, headers=None, verify=False, progress=None, compression=None):  # -> AsyncData, see async_data.py
+		import asyncio
+		from .async_data import AsyncData
+		return AsyncData(await asyncio.to_thread(Data.load, location, headers, verify, progress, compression))
+
+	def save(self, location, max_size=None, compression=None, size='uncompressed'):  # max_size: bytes of a part, size: 'uncompressed' | 'compressed'
 		if self.reader.is_zip and not location.endswith('.zip'):
 			location += '.zip'
-		writer = DataWriter(self.reader)
+		writer = DataWriter(self.reader, compression)
 		if max_size is None:
 			writer.write_single_file(location)
 		else:
-			writer.write_package(location, max_size)
+			writer.write_package(location, max_size, size)
 		return self
 
 	@staticmethod
-	def zip(location, max_size=None):
-		data = io.BytesIO()
-		with zipfile.ZipFile(data, 'w') as f:
-			for root, _, files in os.walk(location):
-				for file in files:
-					file_path = os.path.join(root, file)
-					f.write(file_path, os.path.relpath(file_path, start=location))
-		data.seek(0)
+	def zip(location, max_size=None):  # archive is streamed while it is saved
 		d = Data(DataReader())
-		d.reader._data     = data
+		d.reader._data     = ChunkStream(Archive.zip_gen(location))
 		d.reader.is_local  = True
 		d.reader.is_binary = True
 		d.reader.is_zip    = True
 		return d
 
-	def unzip(self, location):
-		buffer = io.BytesIO()
-		for f in self.reader.file_gen():
-			buffer.write(f.read() if self.reader.is_local else f.content)
+	def unzip(self, location, workers=None):
+		if self.reader.is_local and self.reader._data is None:
+			Archive.unzip(Archive.local_parts(self.reader.location), location, workers)
+			return self
 
-		buffer.seek(0)
-		File.rm(location)
-
-		with zipfile.ZipFile(buffer, 'r') as f:
-			f.extractall(location)
+		# remote parts and in-memory archives are spooled to disk, not to memory
+		tmp = tempfile.mkdtemp(prefix='puerml_unzip_')
+		try:
+			paths = []
+			for f in self.reader.file_gen():
+				paths.append(os.path.join(tmp, str(len(paths))))
+				with open(paths[-1], 'wb') as out:
+					File.copy(f, out)
+			Archive.unzip(paths, location, workers)
+		finally:
+			File.rm(tmp)
 		return self
 
 	@property
@@ -248,23 +660,84 @@ class Data:
 	def line_gen(self):
 		return self.reader.line_gen()
 
-	def batch_gen(self, batch_size=10, preprocess=None):
+	@property
+	def manifest(self):
+		return self.reader._load_manifest()
+
+	@property
+	def line_index(self):
 		if self.reader.is_binary:
-			raise Exception('Batch generator is not supported for binary files')
+			raise Exception('Line index is not supported for binary files')
+		if self._line_index is None:
+			if self.reader.location is None:
+				raise Exception('Line index requires a location')
+			self.reader._load_manifest()
+			if self.reader.compression:
+				raise Exception('Line index is not supported for compressed data')
+			self._line_index = LineIndex.load(self.reader)
+		return self._line_index
+
+	@property
+	def num_lines(self):
+		return len(self.line_index)
+
+	def read_lines(self, start, stop=None):
+		stop = self.num_lines if stop is None else stop
+		return [line.strip() for line in self.line_index.read(start, stop)]
+
+	def shard(self, i, n, batch_size=10000):  # lines of shard i out of n contiguous shards
+		size  = self.num_lines
+		start = size * i // n
+		stop  = size * (i + 1) // n
+		for s in range(start, stop, batch_size):
+			yield from self.read_lines(s, min(s + batch_size, stop))
+
+	def __getitem__(self, key):
+		if isinstance(key, slice):
+			start, stop, step = key.indices(self.num_lines)
+			if step == 1:
+				return self.read_lines(start, stop)
+			return [self[n] for n in range(start, stop, step)]
+		n = key + self.num_lines if key < 0 else key
+		if not 0 <= n < self.num_lines:
+			raise IndexError('line index out of range')
+		return self.read_lines(n, n + 1)[0]
+
+	def lines_from(self, line):  # line generator starting at line number `line` of a package
+		if self.manifest is None:
+			raise Exception(f'Package "{self.reader.location}" has no manifest')
+		part, skip = self.manifest.locate(line)
+		for n, l in enumerate(self.reader.line_gen(start=part)):
+			if n >= skip:
+				yield l
+
+	def _line_batch_gen(self, batch_size, drop_last=False):
 		batch = []
 		for line in self.reader.line_gen():
-			if len(batch) < batch_size:
-				if preprocess:
-					line = preprocess(line)
-				batch.append(line)
-			else:
+			batch.append(line)
+			if len(batch) == batch_size:
 				yield batch
 				batch = []
-		if len(batch) > 0:
+		if batch and not drop_last:
 			yield batch
 
+	def batch_gen(self, batch_size=10, preprocess=None, batch_preprocess=None, last='keep', fill=None, workers=None, pool='thread', prefetch=None):
+		# last: keep | drop | pad the last short batch with fill
+		# workers: batches are prepared by a thread / process pool, at most prefetch (2 * workers) ahead,
+		#          a process pool needs picklable preprocess functions
+		if self.reader.is_binary:
+			raise Exception('Batch generator is not supported for binary files')
+		if last not in ('keep', 'drop', 'pad'):
+			raise Exception(f'Unsupported last batch policy "{last}", expected keep, drop or pad')
+		prepare = partial(_prepare_batch, preprocess, batch_preprocess, batch_size if last == 'pad' else 0, fill)
+		batches = self._line_batch_gen(batch_size, last == 'drop')
+		if workers:
+			yield from Pool.imap(prepare, batches, workers, pool, prefetch)
+		else:
+			yield from map(prepare, batches)
+
 	def chunk_gen(self, chunk_size=1024):
-		if not self.reader.is_binary:
+		if not self.reader._detect():
 			raise Exception('Chunk generator is only supported for binary files')
 		return self.reader.chunk_gen(chunk_size)
 
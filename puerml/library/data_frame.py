@@ -1,7 +1,15 @@
 import os
 import csv
 
-from .data import Data
+from .compression   import Compression
+from .csv_codec     import CsvCodec
+from .data          import Data
+from .external_sort import ExternalSort, SortKey
+from .group_by      import GroupBy
+from .index         import HashIndex, SortedIndex, OPS
+from .join          import HashJoin
+from .loader        import ParallelLoader
+from .schema        import Schema
 
 __all__ = ['DataFrameRow', 'DataFrame']
 
@@ -14,6 +22,8 @@ class DataFrameRow(list):
 	def set(self, col, value):
 		col_idx = self.df.cols.get(col, None)
 		if col_idx is not None:
+			if col in self.df.indices:
+				self.df._index_row_set(self, col, self[col_idx], value)
 			self[col_idx] = value
 
 	def get(self, col):
@@ -36,31 +46,81 @@ class DataFrameRow(list):
 		return DataFrameRow([*self], df=df)
 
 class DataFrame:
-	_id = 1
+	_id          = 1
+	_index_types = {'hash': HashIndex, 'sorted': SortedIndex}
 	
 	######################################################
 
 	@staticmethod
-	def open(file_path, delimiter=None, encoding='utf-8'):
-		df = DataFrame()
-		df.append_file(file_path, delimiter, encoding)
+	def _create(header=None, columnar=False):
+		if columnar:
+			from .columnar import ColumnarDataFrame
+			return ColumnarDataFrame(header)
+		return DataFrame(header)
+
+	@staticmethod
+	def open(file_path, delimiter=None, encoding='utf-8', columnar=False, workers=None):
+		df = DataFrame._create(columnar=columnar)
+		df.append_file(file_path, delimiter, encoding, workers)
 		return df
 		
 	@staticmethod
-	def load(location, http_headers=None):
-		d   = Data.load(location, headers=http_headers)
+	def _read(location, http_headers=None):  # -> header, rows generator
+		d = Data.load(location, headers=http_headers)
 		type_to_delim = {'csv': ',', 'tsv': '\t'}
 		if d.type in type_to_delim:
 			delimiter = type_to_delim[d.type]
 		else:
 			raise Exception('Delimiter can not be None')
 
-		lines  = d.line_gen
-		header = next(lines).split(delimiter)
-		df = DataFrame(header)
-		for line in lines:
-			df.append(line.split(delimiter))
-		return df
+		rows   = CsvCodec(delimiter).decode_lines(d.reader.line_gen(strip=False))
+		header = next(rows)
+		return header, rows
+
+	@staticmethod
+	def _write(location, header, rows, max_size=None):
+		_, file_ext = os.path.splitext(Compression.strip(location).lower())
+		delimiter = {'.tsv':'\t', '.csv':','}.get(file_ext)
+		if not delimiter:
+			raise Exception(f'Unsupported file type: "{file_ext}"')
+
+		def line_gen():
+			codec = CsvCodec(delimiter)
+			yield codec.encode(header)
+			yield from codec.encode_rows(rows)
+
+		Data.set(line_gen()).save(location, max_size)
+
+	@staticmethod
+	def load(location, http_headers=None, columnar=False, cols=None, where=None, schema=None):  # where: [(col, op, value)], schema: Schema | True
+		from .column_store import ColumnStore
+		if ColumnStore.is_store(location):
+			df = ColumnStore.load(location, cols, where, http_headers)
+			return df if columnar else df.to_rows()
+
+		header, rows = DataFrame._read(location, http_headers)
+		if schema:
+			schema, rows = Schema.resolve(schema, rows, header)
+			converters   = schema.converters(header)
+			rows         = (Schema.convert_row(row, converters) for row in rows)
+		if where:
+			positions = {h: n for n, h in enumerate(header)}
+			tests     = [(positions[col], OPS[op], value) for col, op, value in where]
+			rows      = (
+				row for row in rows
+				if all(test(row[n] if n < len(row) else '', value) for n, test, value in tests)
+			)
+		df = DataFrame._create(header, columnar)
+		if schema and columnar:
+			df.columns = [schema.column(h) for h in header]
+		for row in rows:
+			df.append(row)
+		return df.alter(cols) if cols else df
+
+	@staticmethod
+	def scan(location, http_headers=None):
+		from .scan import DataFrameScan
+		return DataFrameScan(location, http_headers)
 
 	######################################################
 			
@@ -69,7 +129,7 @@ class DataFrame:
 		self.rows    = []
 		self.header  = None
 		self.cols    = None
-		self.indices = {}  # {col_name: {col_value.lower(): set(rowids)}}
+		self.indices = {}  # {col_name: HashIndex | SortedIndex}
 		self.n       = 0
 
 		if header:
@@ -82,7 +142,10 @@ class DataFrame:
 		DataFrame._id += 1
 
 	def __getitem__(self, key):  # [2:]
-		return DataFrame(self.header, self.rows[key])
+		df = DataFrame(self.header)
+		for row in self.rows[key]:
+			df.append(self._share(row, df))
+		return df
 
 	def __len__(self):
 		return len(self.rows)
@@ -105,14 +168,66 @@ class DataFrame:
 		print('Error:', s)
 
 	def get_index(self, col):
+		index = self.indices.get(col)
+		if index is not None:
+			return {value: self.rows[index.lookup(value)[-1]] for value in index.values()}
 		return {
 			row.get(col): row
 			for row in self
 		}
 
+	def _new(self, header=None):
+		return DataFrame(header)
+
 	def _update_header_positions(self):
 		self.cols = { self.header[n]: n for n in range(len(self.header)) }
 
+	@staticmethod
+	def _on(on):
+		return on if isinstance(on, tuple) else (on, on)
+
+	@staticmethod
+	def _test(test, value, target):  # values that do not compare do not match, as in SortedIndex
+		try:
+			return test(value, target)
+		except TypeError:
+			return False
+
+	def _share(self, row, df):  # -> row of self for df, a copy when an index of self follows it
+		return row.copy(df) if self.indices and isinstance(row, DataFrameRow) else row
+
+	def _index_values(self, col):
+		return (row.get(col) for row in self.rows)
+
+	def _index_append(self, n):
+		for col, index in self.indices.items():
+			index.add(self.get(col, n), n)
+
+	def _index_set(self, col, n, old, new):
+		index = self.indices.get(col)
+		if index is not None:
+			index.remove(old, n)
+			index.add(new, n)
+
+	def _index_row_set(self, row, col, old, new):
+		for n in self.indices[col].lookup(old):
+			if self.rows[n] is row:
+				self._index_set(col, n, old, new)
+				break
+
+	def _index_rebuild(self, cols=None):
+		for col in list(self.indices):
+			if col not in self.cols:
+				del self.indices[col]
+			elif cols is None or col in cols:
+				self.indices[col].build(self._index_values(col))
+
+	def _index_like(self, df):
+		for col, index in df.indices.items():
+			if col in self.cols:
+				self.create_index(col, index.kind)
+		return self
+
 	def _join_headers(self, df):
 		header = self.header.copy()
 		for h in df.header:
@@ -124,6 +239,16 @@ class DataFrame:
 
 	######################################################
 
+	def create_index(self, col, kind='hash'):
+		if kind not in self._index_types:
+			raise Exception(f'Unsupported index type: "{kind}"')
+		self.indices[col] = self._index_types[kind](self._index_values(col))
+		return self
+
+	def drop_index(self, col):
+		self.indices.pop(col, None)
+		return self
+
 	def set_header(self, header):
 		self.header = header.copy()
 		self._update_header_positions()
@@ -132,8 +257,19 @@ class DataFrame:
 	def append(self, row):
 		if not isinstance(row, DataFrameRow):
 			row = DataFrameRow(row, df=self)
-		row.df = self
+		elif row.df is not self:
+			if self.indices:
+				row = row.copy(self)  # indexed frames own their rows, row.set updates one frame's indexes
+			else:
+				row.df = self  # shared with the other frame, see _share
 		self.rows.append(row)
+		if self.indices:
+			self._index_append(len(self.rows) - 1)
+		return self
+
+	def _extend(self, columns, size):
+		for row in zip(*columns):
+			self.append(list(row))
 		return self
 
 	def alter(self, cols, copy=False):
@@ -146,6 +282,9 @@ class DataFrame:
 		if not copy:
 			self.set_header(cols)
 			self.rows = df.rows
+			for row in self.rows:
+				row.df = self
+			self._index_rebuild()
 			df = self
 		return df
 
@@ -174,6 +313,7 @@ class DataFrame:
 		for row in self.rows:
 			del row[col_idx]
 		self._update_header_positions()
+		self.drop_index(col)
 		return self
 
 	def remove_cols(self, cols):
@@ -182,7 +322,10 @@ class DataFrame:
 		return self
 
 	def set(self, col, n, value):
-		self.rows[n].set(col, value)
+		col_idx = self.cols.get(col, None)
+		if col_idx is not None:
+			self._index_set(col, n, self.rows[n][col_idx], value)
+			self.rows[n][col_idx] = value
 		return self
 
 	def get(self, col, n):
@@ -191,42 +334,74 @@ class DataFrame:
 	def map(self, f):  # f(row, n, df)
 		for n in range(len(self.rows)):
 			f(self.rows[n])
+		self._index_rebuild()
 		return self
 
 	def map_col(self, col, f):
-		for n in range(len(self.rows)):
-			self.rows[n].set(col, f(self.rows[n].get(col)))
+		col_idx = self.cols.get(col, None)
+		if col_idx is not None:
+			for row in self.rows:
+				row[col_idx] = f(row[col_idx])
+			self._index_rebuild([col])
 		return self
 
 	def map_cols(self, cols, f):
-		for n in range(len(self.rows)):
-			for col in cols:
-				self.rows[n].set(col, f(self.rows[n].get(col)))
+		for col in cols:
+			self.map_col(col, f)
 		return self
 
 	def cast(self, col, _type=str):
-		for row in self:
-			row.set(col, _type(row.get(col)))
-		return self
+		return self.map_col(col, _type)
 
 	def filter(self, f):
 		df = DataFrame(self.header)
 		for n in range(len(self.rows)):
 			if f(self.rows[n], n):
-				df.append(self.rows[n])
-		return df
+				df.append(self._share(self.rows[n], df))
+		return df._index_like(self)
+
+	def where(self, col, op, value):
+		if op not in OPS:
+			raise Exception(f'Unsupported operator: "{op}"')
+		index = self.indices.get(col)
+		ids   = index.select(op, value) if index is not None else None
+		if ids is None:
+			test = OPS[op]
+			ids  = [n for n in range(len(self.rows)) if self._test(test, self.get(col, n), value)]
+		df = self._new(self.header)
+		for n in ids:
+			df.append(self._share(self.rows[n], df))
+		return df._index_like(self)
+
+	def group_by(self, cols):
+		return GroupBy(self, cols)
 
 	def sort(self, f, cutoff=None):
-		if cutoff is not None:
-			items = sorted([(item, f(item)) for item in self.rows], key=lambda x: x[1])
-			self.rows = [item for item, value in items if value > cutoff]
-		else:
+		if cutoff is None:
 			self.rows.sort(key=f)
-
-	def sort_by(self, col, asc=True):
-		self.rows.sort(key=lambda row: row[self.cols[col]], reverse=not asc)
+		else:
+			keys      = [(key, n) for n, key in enumerate(map(f, self.rows)) if key > cutoff]  # f once per row
+			self.rows = [self.rows[n] for _, n in sorted(keys)]
+		self._index_rebuild()
+
+	def sort_by(self, col, asc=True):  # col: col | [cols], asc: bool | [bool]
+		cols = [col] if isinstance(col, str) else col
+		for col, asc in reversed(list(zip(cols, SortKey.ascending(cols, asc)))):
+			col_idx = self.cols[col]
+			self.rows.sort(key=lambda row: row[col_idx], reverse=not asc)
+		self._index_rebuild()
+
+	def top(self, k, col, asc=True):
+		df = self._new(self.header)
+		for row in ExternalSort(self.header, col, asc).top(self.rows, k):
+			df.append(self._share(row, df))
+		return df
 
 	def find(self, col, value):
+		index = self.indices.get(col)
+		if index is not None:
+			ids = index.lookup(value)
+			return (self.rows[ids[0]], ids[0]) if ids else (None, None)
 		n = 0
 		for row in self:
 			if row.get(col) == value:
@@ -234,40 +409,42 @@ class DataFrame:
 			n += 1
 		return None, None
 
-	def match(self, df, f):  # f(lrow, rrow) -> Falsey | new row
+	def match(self, df, f, on=None):  # f(lrow, rrow) -> Falsey | new row
+		if on is not None:
+			for l, r in HashJoin(self, df, *self._on(on), build='right').pairs():
+				f(l, r)
+			return self
 		for l in range(len(self.rows)):
 			for r in range(len(df.rows)):
 				f(self.rows[l], df.rows[r])
 		return self
 
-	def ljoin(self, df, f1, f2):
+	def join(self, df, on, how='inner', build=None):  # on: col | f(row) | (left, right)
+		join = HashJoin(self, df, *self._on(on), how=how, build=build)
+		df1  = self._new(self._join_headers(df))
+		for row in join:
+			df1.append(row)
+		return df1
+
+	def ljoin(self, df, f1, f2):  # f1, f2: column names or f(row), an index on column f2 of df is used
 		header = self.header.copy() + [
 			h if h not in self.header else f'_{h}' for h in df.header 
 		]
-		result_df = DataFrame(header)
-
-		self.add_col('__join__1', f1)
-		df.add_col('__join__2', f2)
-		
-		for row in self:
-			value1    = row.get('__join__1')
-			row2, _   = df.find('__join__2', value1)
-			if row2 is not None:
-				result_df.append(row[:-1] + row2[:-1])
-			else:
-				result_df.append(row[:-1] + [''] * (len(df.header) -1))
-
-		self.remove_col('__join__1')
-		df.remove_col('__join__2')
+		result_df = self._new(header)
+		for row in HashJoin(self, df, f1, f2, how='left', many=False):
+			result_df.append(row)
 		return result_df
 
-	def match_copy(self, df, header, f):  # f(lrow, rrow) -> Falsey | new row
-		df1 = DataFrame(header)
-		for l in self:
-			for r in df:
-				row = f(l, r)
-				if row is not None:
-					df1.append(row)
+	def match_copy(self, df, header, f, on=None):  # f(lrow, rrow) -> Falsey | new row
+		df1 = self._new(header)
+		if on is not None:
+			pairs = HashJoin(self, df, *self._on(on), build='right').pairs()
+		else:
+			pairs = ((l, r) for l in self for r in df)
+		for l, r in pairs:
+			row = f(l, r)
+			if row is not None:
+				df1.append(row)
 		return df1
 
 	def transform(self, header, f):
@@ -276,11 +453,20 @@ class DataFrame:
 			df.append(f(row))
 		return df
 
-	def append_file(self, file_path, delimiter=None, encoding='utf-8'):
+	def append_file(self, file_path, delimiter=None, encoding='utf-8', workers=None):
 		file_name, file_ext = os.path.splitext(file_path)
 		if delimiter is None:
 			delimiter = {'.tsv':'\t', '.csv':','}.get(file_ext.lower())
 
+		if workers is not None or os.path.isdir(file_path):
+			loader = ParallelLoader(file_path, delimiter, encoding, workers or 1)
+			header = loader.read_header()
+			if not self.header:
+				self.set_header(header)
+			for size, columns in loader.column_gen(len(header)):
+				self._extend(columns, size)
+			return self
+
 		with open(file_path, 'r', encoding=encoding) as f:
 			reader = csv.reader(f, delimiter=delimiter)
 			header = next(reader)
@@ -294,30 +480,26 @@ class DataFrame:
 		df = DataFrame(self.header)
 		for n in range(len(self.rows)):
 			df.append(self.rows[n].copy(df))
-		return df
+		return df._index_like(self)
 
 	def save(self, location, max_size=None):
-		_, file_ext = os.path.splitext(location.lower())
-		delimiter = {'.tsv':'\t', '.csv':','}.get(file_ext)
-		if delimiter:
-			header = delimiter.join(self.header)
-			if len(self.header) > 1:
-				rows = [delimiter.join(row) for row in self]
-			else:
-				rows = [''.join(row) for row in self]
-
-			rows.insert(0, header)
-			data = '\n'.join(rows)
-
-			Data.set(data).save(location, max_size)
-			return self
+		from .column_store import ColumnStore
+		if location.lower().endswith(ColumnStore.extension):
+			ColumnStore.save(self, location, max_size)
 		else:
-			raise Exception(f'Unsupported file type: "{file_ext}"')
+			DataFrame._write(location, self.header, self.rows, max_size)
+		return self
+
+	def to_columnar(self):
+		from .columnar import ColumnarDataFrame
+		return ColumnarDataFrame.from_df(self)
 
 	def to_list(self, col, _type=str):
 		return [_type(self.rows[n].get(col)) for n in range(len(self.rows))]
 
 	def to_unique_list(self, col):
+		if col in self.indices:
+			return self.indices[col].values()
 		values = set()
 		for row in self:
 			values.add(row.get(col))
@@ -1,12 +1,7 @@
 import re
-import numpy as np
-import sympy as sp
 
-from gensim.models         import KeyedVectors
-from gensim.downloader     import load
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import normalize
-from numpy.linalg          import norm
+# numpy, sympy, gensim and sklearn are imported by the methods using them,
+# they take seconds to import
 
 
 class Embeddings:
@@ -15,9 +10,11 @@ class Embeddings:
 		
 	@staticmethod
 	def load(path):
+		from gensim.downloader import load
 		return Embeddings(load(path))
 
 	def query(self, expression, topn=4, probs=False):
+		import sympy as sp
 		expr = sp.sympify(expression)
 		
 		# Recursive function to evaluate the expression
@@ -65,6 +62,9 @@ class Embeddings:
 		return []
 
 	def to_primary(self):
+		import numpy as np
+		from gensim.models         import KeyedVectors
+		from sklearn.decomposition import PCA
 		if self.model is None: raise ValueError('Model not loaded')
 
 		vv = self.model.vectors
@@ -79,6 +79,8 @@ class Embeddings:
 		return emb 
 
 	def filter(self, filter_func, batch_size=1000):
+		import numpy as np
+		from gensim.models import KeyedVectors
 		if self.model is None: raise ValueError('Model not loaded')
 		
 		emb       = Embeddings()
@@ -103,6 +105,9 @@ class Embeddings:
 		return emb
 
 	def rotate_to(self, a, b):
+		import numpy as np
+		from gensim.models         import KeyedVectors
+		from sklearn.preprocessing import normalize
 		a_vector = self.model[a]
 		b_vector = self.model[b]
 		axis     = a_vector - b_vector
@@ -122,6 +127,9 @@ class Embeddings:
 
 	def align_axes(self, word_pairs):
 		""" Align multiple dimensions based on provided word pairs. """
+		import numpy as np
+		from gensim.models import KeyedVectors
+		from numpy.linalg  import norm
 		vector_size = self.model.vector_size
 		basis = np.eye(vector_size)  # Start with an identity matrix as basis
 		
@@ -153,6 +161,7 @@ class Embeddings:
 		return emb
 
 	def display_extremes(self, dimension, n_words=10):
+		import numpy as np
 		# Sort words according to the dimension (either positive or negative direction)
 		sorted_indices = np.argsort(self.model.vectors[:, dimension])
 
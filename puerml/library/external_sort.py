@@ -0,0 +1,104 @@
+import os
+import json
+import heapq
+import tempfile
+
+from .data       import Data
+from puerml.util import File
+
+__all__ = ['SortKey', 'ExternalSort']
+
+
+'''
+External merge sort for row streams that do not fit in memory.
+
+Rows are collected in runs of max_rows, every run is sorted in memory and
+spilled to a temporary Data package (json list per line, so value types
+survive), then all runs are k-way merged with heapq.merge.
+'''
+
+class SortKey:
+	__slots__ = ('values', 'asc')
+
+	def __init__(self, values, asc):
+		self.values = values
+		self.asc    = asc
+
+	def __lt__(self, other):
+		for a, b, asc in zip(self.values, other.values, self.asc):
+			if a != b:
+				return a < b if asc else a > b
+		return False
+
+	def __eq__(self, other):
+		return self.values == other.values
+
+	@staticmethod
+	def ascending(cols, asc):
+		if isinstance(asc, bool):
+			return [asc] * len(cols)
+		if len(asc) != len(cols):
+			raise Exception('Sort direction is required for every key')
+		return list(asc)
+
+############################################################
+
+class ExternalSort:
+	def __init__(self, header, cols, asc=True, max_rows=1000000, max_size=64 * 1024**2, tmp_dir=None):
+		self.cols     = [cols] if isinstance(cols, str) else list(cols)
+		self.asc      = SortKey.ascending(self.cols, asc)
+		self.header   = header
+		self.max_rows = max_rows
+		self.max_size = max_size
+		self.tmp_dir  = tmp_dir
+		self.runs     = []
+
+		positions      = {h: n for n, h in enumerate(header)}
+		self.positions = [positions[col] for col in self.cols]
+
+	def _key(self, row):
+		return SortKey([row[n] if n < len(row) else '' for n in self.positions], self.asc)
+
+	def _sort_run(self, rows):
+		for n, asc in reversed(list(zip(self.positions, self.asc))):
+			rows.sort(key=lambda row: row[n] if n < len(row) else '', reverse=not asc)
+		return rows
+
+	def _spill(self, rows, location):
+		location = os.path.join(location, str(len(self.runs)))
+		lines    = (json.dumps(list(row)) for row in self._sort_run(rows))
+		Data.set(lines).save(location, self.max_size)
+		self.runs.append(location)
+
+	@staticmethod
+	def _read_run(location):
+		reader = Data.load(location).reader
+		reader.is_binary = False
+		for line in reader.line_gen(strip=False):
+			yield json.loads(line)
+
+	######################################################
+
+	def sort(self, rows):  # -> sorted rows generator
+		location = tempfile.mkdtemp(prefix='puerml_sort_', dir=self.tmp_dir)
+		try:
+			run = []
+			for row in rows:
+				run.append(row)
+				if len(run) >= self.max_rows:
+					self._spill(run, location)
+					run = []
+
+			if not self.runs:
+				yield from self._sort_run(run)
+				return
+			if run:
+				self._spill(run, location)
+
+			yield from heapq.merge(*[self._read_run(r) for r in self.runs], key=self._key)
+		finally:
+			self.runs = []
+			File.rm(location)
+
+	def top(self, rows, k):
+		return heapq.nsmallest(k, rows, key=self._key)
@@ -0,0 +1,223 @@
+import math
+
+__all__ = ['GroupBy']
+
+
+'''
+Hash group by with one pass aggregation
+
+df.group_by(['country', 'city']).agg({
+	'age'    : ['mean', 'p90'],
+	'id'     : 'count',
+	'visits' : ('email', 'distinct'),  # output name: (col, function)
+})
+
+Functions: count, sum, mean, min, max, distinct, median, p<percent> (p90, p99.9)
+Values are processed column by column in batches, a DataFrameScan source
+is aggregated straight from its line stream.
+'''
+
+def _is_null(value):
+	return value is None or value == ''
+
+def _num(value):
+	if isinstance(value, str):
+		try:
+			return int(value)
+		except ValueError:
+			return float(value)
+	return value
+
+def _comparable(value):
+	try:
+		return _num(value)
+	except ValueError:
+		return value
+
+############################################################
+
+class _Agg:
+	def __init__(self):
+		self.state = []
+
+	def _initial(self):
+		return None
+
+	def grow(self, size):
+		while len(self.state) < size:
+			self.state.append(self._initial())
+
+	def update(self, gids, values):
+		state = self.state
+		for g, v in zip(gids, values):
+			if not _is_null(v):
+				state[g] = self._step(state[g], v)
+
+	def result(self, g):
+		return self.state[g]
+
+class _Count(_Agg):
+	def _initial(self):
+		return 0
+
+	def update(self, gids, values):
+		state = self.state
+		for g, v in zip(gids, values):
+			if not _is_null(v):
+				state[g] += 1
+
+class _Sum(_Agg):
+	def _initial(self):
+		return 0
+
+	def _step(self, s, v):
+		return s + _num(v)
+
+class _Mean(_Agg):
+	def _initial(self):
+		return [0, 0]
+
+	def update(self, gids, values):
+		state = self.state
+		for g, v in zip(gids, values):
+			if not _is_null(v):
+				s = state[g]
+				s[0] += _num(v)
+				s[1] += 1
+
+	def result(self, g):
+		s, n = self.state[g]
+		return s / n if n else None
+
+class _Min(_Agg):
+	def _step(self, m, v):
+		v = _comparable(v)
+		return v if m is None or v < m else m
+
+class _Max(_Agg):
+	def _step(self, m, v):
+		v = _comparable(v)
+		return v if m is None or v > m else m
+
+class _Distinct(_Agg):
+	def _initial(self):
+		return set()
+
+	def update(self, gids, values):
+		state = self.state
+		for g, v in zip(gids, values):
+			if not _is_null(v):
+				state[g].add(v)
+
+	def result(self, g):
+		return len(self.state[g])
+
+class _Quantile(_Agg):
+	def __init__(self, q):
+		super().__init__()
+		self.q = q
+
+	def _initial(self):
+		return []
+
+	def update(self, gids, values):
+		state = self.state
+		for g, v in zip(gids, values):
+			if not _is_null(v):
+				state[g].append(_num(v))
+
+	def result(self, g):
+		values = sorted(self.state[g])
+		if not values:
+			return None
+		k    = (len(values) - 1) * self.q
+		f, c = math.floor(k), math.ceil(k)
+		return values[f] + (values[c] - values[f]) * (k - f)
+
+############################################################
+
+class GroupBy:
+	funcs = {
+		'count'    : _Count,
+		'sum'      : _Sum,
+		'mean'     : _Mean,
+		'min'      : _Min,
+		'max'      : _Max,
+		'distinct' : _Distinct,
+		'median'   : lambda: _Quantile(0.5),
+	}
+
+	def __init__(self, source, cols, batch_size=10000, columnar=False):
+		self.source     = source
+		self.cols       = [cols] if isinstance(cols, str) else list(cols)
+		self.batch_size = batch_size
+		self.columnar   = columnar
+
+	@classmethod
+	def _agg(cls, func):
+		if func in cls.funcs:
+			return cls.funcs[func]()
+		if func.startswith('p'):
+			try:
+				percent = float(func[1:])
+			except ValueError:
+				percent = None
+			if percent is not None:
+				if not 0 <= percent <= 100:
+					raise Exception(f'Percentile out of range 0-100: "{func}"')
+				return _Quantile(percent / 100)
+		raise Exception(f'Unsupported aggregation: "{func}"')
+
+	def _specs(self, spec):  # -> [(name, col, func)]
+		specs = []
+		for key, value in spec.items():
+			if isinstance(value, tuple):
+				specs.append((key, value[0], value[1]))
+			else:
+				for func in [value] if isinstance(value, str) else value:
+					specs.append((f'{key}_{func}', key, func))
+		return specs
+
+	def _batches(self, cols):  # -> {col: values}
+		from .scan import DataFrameScan
+		if not isinstance(self.source, DataFrameScan):
+			df = self.source
+			if hasattr(df, 'columns'):
+				yield {col: df.columns[df.cols[col]] for col in cols}
+			else:
+				yield {col: [row.get(col) for row in df.rows] for col in cols}
+			return
+
+		batch = {col: [] for col in cols}
+		size  = 0
+		for row in self.source:
+			for col in cols:
+				batch[col].append(row.get(col))
+			size += 1
+			if size == self.batch_size:
+				yield batch
+				batch = {col: [] for col in cols}
+				size  = 0
+		if size:
+			yield batch
+
+	def agg(self, spec):
+		from .data_frame import DataFrame
+		specs = self._specs(spec)
+		aggs  = [self._agg(func) for _, _, func in specs]
+		cols  = list(dict.fromkeys(self.cols + [col for _, col, _ in specs]))
+		ids   = {}
+
+		for batch in self._batches(cols):
+			keys = batch[self.cols[0]] if len(self.cols) == 1 else zip(*(batch[col] for col in self.cols))
+			gids = [ids.setdefault(key, len(ids)) for key in keys]
+			for agg, (_, col, _) in zip(aggs, specs):
+				agg.grow(len(ids))
+				agg.update(gids, batch[col])
+
+		columnar = self.columnar or hasattr(self.source, 'columns')
+		df = DataFrame._create(self.cols + [name for name, _, _ in specs], columnar)
+		for key, g in ids.items():
+			key = [key] if len(self.cols) == 1 else list(key)
+			df.append(key + [agg.result(g) for agg in aggs])
+		return df
@@ -0,0 +1,157 @@
+import bisect
+import operator
+
+__all__ = ['HashIndex', 'SortedIndex', 'OPS']
+
+
+OPS = {
+	'=='         : operator.eq,
+	'!='         : operator.ne,
+	'<'          : operator.lt,
+	'<='         : operator.le,
+	'>'          : operator.gt,
+	'>='         : operator.ge,
+	'in'         : lambda value, values: value in values,
+	'startswith' : lambda value, prefix: str(value).startswith(prefix),
+}
+
+############################################################
+
+class HashIndex:  # {col_value: set(rowids)}
+	kind = 'hash'
+
+	def __init__(self, values=None):
+		self.data = {}
+		if values is not None:
+			self.build(values)
+
+	def build(self, values):
+		self.data = {}
+		for n, value in enumerate(values):
+			self.add(value, n)
+		return self
+
+	def add(self, value, n):
+		ids = self.data.get(value)
+		if ids is None:
+			self.data[value] = {n}
+		else:
+			ids.add(n)
+
+	def remove(self, value, n):
+		ids = self.data.get(value)
+		if ids is not None:
+			ids.discard(n)
+			if not ids:
+				del self.data[value]
+
+	def lookup(self, value):
+		return sorted(self.data.get(value, ()))
+
+	def select(self, op, value):
+		if op == '==':
+			return self.lookup(value)
+		if op == 'in':
+			ids = set()
+			for v in value:
+				ids.update(self.data.get(v, ()))
+			return sorted(ids)
+		return None
+
+	def values(self):
+		return list(self.data.keys())
+
+############################################################
+
+class SortedIndex:  # [((type group, col_value), rowid)] in ascending order
+	kind = 'sorted'
+
+	def __init__(self, values=None):
+		self.data = []
+		if values is not None:
+			self.build(values)
+
+	@staticmethod
+	def _key(value):  # values of different types sort apart instead of raising TypeError
+		if isinstance(value, (int, float)):
+			return (0, value)
+		if isinstance(value, str):
+			return (1, value)
+		return (2, type(value).__name__, value)
+
+	def build(self, values):
+		self.data = sorted((self._key(value), n) for n, value in enumerate(values))
+		return self
+
+	def add(self, value, n):
+		bisect.insort(self.data, (self._key(value), n))
+
+	def remove(self, value, n):
+		item = (self._key(value), n)
+		i    = bisect.bisect_left(self.data, item)
+		if i < len(self.data) and self.data[i] == item:
+			del self.data[i]
+
+	def _group(self, key):  # -> start, end of the values of the type group of key
+		group = key[:-1]
+		end   = group[:-1] + (group[-1] + '\0',) if isinstance(group[-1], str) else (group[0] + 1,)
+		return bisect.bisect_left(self.data, (group,)), bisect.bisect_left(self.data, (end,))
+
+	def _lo(self, key, inclusive):
+		if inclusive:
+			return bisect.bisect_left(self.data, (key,))
+		return bisect.bisect_right(self.data, (key, float('inf')))
+
+	def _hi(self, key, inclusive):
+		if inclusive:
+			return bisect.bisect_right(self.data, (key, float('inf')))
+		return bisect.bisect_left(self.data, (key,))
+
+	def range(self, lo=None, hi=None, lo_inclusive=True, hi_inclusive=True):  # values of the type group of lo / hi
+		if lo is None and hi is None:
+			return sorted(n for _, n in self.data)
+		lo_key = None if lo is None else self._key(lo)
+		hi_key = None if hi is None else self._key(hi)
+		if lo_key and hi_key and lo_key[:-1] != hi_key[:-1]:
+			return []
+		start, end = self._group(lo_key or hi_key)
+		if lo_key:
+			start = self._lo(lo_key, lo_inclusive)
+		if hi_key:
+			end   = self._hi(hi_key, hi_inclusive)
+		return sorted(n for _, n in self.data[start:end])
+
+	def prefix(self, prefix):  # str(value).startswith(prefix), str values by bisect
+		key        = self._key(prefix)
+		start, end = self._group(key)
+		ids        = []
+		for i in range(self._lo(key, True), end):
+			value, n = self.data[i]
+			if not value[-1].startswith(prefix):
+				break
+			ids.append(n)
+		ids += [n for value, n in self.data[:start] + self.data[end:] if str(value[-1]).startswith(prefix)]
+		return sorted(ids)
+
+	def lookup(self, value):
+		key = self._key(value)
+		return sorted(n for _, n in self.data[self._lo(key, True):self._hi(key, True)])
+
+	def select(self, op, value):
+		if op == '==' : return self.lookup(value)
+		if op == '<'  : return self.range(hi=value, hi_inclusive=False)
+		if op == '<=' : return self.range(hi=value)
+		if op == '>'  : return self.range(lo=value, lo_inclusive=False)
+		if op == '>=' : return self.range(lo=value)
+		if op == 'startswith':
+			return self.prefix(str(value))
+		if op == 'in':
+			return sorted({n for v in value for n in self.lookup(v)})
+		return None
+
+	def values(self):
+		values = []
+		for key, _ in self.data:
+			if not values or values[-1] != key[-1]:
+				values.append(key[-1])
+		return values
@@ -0,0 +1,86 @@
+__all__ = ['HashJoin']
+
+
+class HashJoin:
+	hows = ('inner', 'left', 'right', 'outer')
+
+	def __init__(self, left, right, left_key, right_key=None, how='inner', build=None, many=True):
+		if how not in self.hows:
+			raise Exception(f'Unsupported join type: "{how}"')
+		if build is None:
+			build = 'right' if not many or len(right) <= len(left) else 'left'
+		if not many and build != 'right':
+			raise Exception('Single match join must build on the right side')
+
+		right_key = right_key if right_key is not None else left_key
+
+		self.left      = left
+		self.right     = right
+		self.left_on   = left_key
+		self.right_on  = right_key
+		self.left_key  = self._key(left_key)
+		self.right_key = self._key(right_key)
+		self.how       = how
+		self.build     = build
+		self.many      = many
+
+	@staticmethod
+	def _key(key):
+		if callable(key):
+			return key
+		return lambda row: row.get(key)
+
+	def _lookup(self, df, on, key):
+		index = df.indices.get(on) if isinstance(on, str) else None
+		if index is not None:
+			if self.many:
+				return index.lookup
+			return lambda k: index.lookup(k)[:1]
+
+		table = {}
+		for n, row in enumerate(df.rows):
+			k = key(row)
+			if k in table:
+				if self.many:
+					table[k].append(n)
+			else:
+				table[k] = [n]
+		return table.get
+
+	######################################################
+
+	def pairs(self):  # (lrow, rrow), missing side is None
+		if self.build == 'right':
+			build, build_on, build_key, probe, probe_key = self.right, self.right_on, self.right_key, self.left, self.left_key
+			build_outer = self.how in ('right', 'outer')
+			probe_outer = self.how in ('left', 'outer')
+		else:
+			build, build_on, build_key, probe, probe_key = self.left, self.left_on, self.left_key, self.right, self.right_key
+			build_outer = self.how in ('left', 'outer')
+			probe_outer = self.how in ('right', 'outer')
+
+		build_rows = build.rows
+		lookup     = self._lookup(build, build_on, build_key)
+		matched    = set()
+		swap       = self.build == 'left'
+
+		for prow in probe.rows:
+			ns = lookup(probe_key(prow))
+			if ns:
+				for n in ns:
+					if build_outer:
+						matched.add(n)
+					yield (build_rows[n], prow) if swap else (prow, build_rows[n])
+			elif probe_outer:
+				yield (None, prow) if swap else (prow, None)
+
+		if build_outer:
+			for n in range(len(build_rows)):
+				if n not in matched:
+					yield (build_rows[n], None) if swap else (None, build_rows[n])
+
+	def __iter__(self):
+		l_blank = [''] * len(self.left.header)
+		r_blank = [''] * len(self.right.header)
+		for lrow, rrow in self.pairs():
+			yield (l_blank if lrow is None else list(lrow)) + (r_blank if rrow is None else list(rrow))
@@ -1,11 +1,111 @@
 import json
+import math
+import importlib
 
-from .data import Data
+from itertools import islice
+
+from .data       import Data
+from .index      import OPS
+from .schema     import Schema
+from puerml.util import Pool
 
 __all__ = ['Jsonl']
 
 
+'''
+Json lines, one record per line
+
+Jsonl.save(records, 'mypackage.jsonl', max_size)
+Jsonl.load('mypackage.jsonl')
+
+Records are plain json, which already escapes newlines inside strings.
+Files written by the older format, where newlines in strings were replaced
+with "\\n" before encoding, are read and written with escaped=True.
+
+The json backend is the standard library json, Jsonl.use('orjson') selects
+orjson, which is faster and writes compact separators. Records with NaN or
+Infinity are written by json with either backend.
+
+With workers=N records are encoded / decoded in batches by N processes,
+in order, with at most 2 * N batches in flight.
+
+Jsonl.load('mypackage.jsonl', fields=['id', 'text'], where=[('lang', '==', 'en')])
+Jsonl.to_dataframe('mypackage.jsonl', ['id', 'text'], where, columnar=True)
+
+where takes DataFrame.load conditions, a record missing a condition field
+does not match. Lines without escapes that do not contain a compared string
+are skipped undecoded. to_dataframe fills columns straight from the decoded
+records, missing fields are ''.
+
+schema=True infers a Schema from the first records, values are parsed into
+its types: Jsonl.to_dataframe(location, fields, schema=True, columnar=True)
+'''
+
+def _non_finite(value):  # NaN or Infinity anywhere in value
+	if isinstance(value, float):
+		return not math.isfinite(value)
+	if isinstance(value, dict):
+		return any(_non_finite(v) for v in value.values())
+	if isinstance(value, (list, tuple)):
+		return any(_non_finite(v) for v in value)
+	return False
+
+############################################################
+
+class _JsonBackend:
+	name = 'json'
+
+	@staticmethod
+	def dumps(item):
+		return json.dumps(item)
+
+	@staticmethod
+	def loads(line):
+		return json.loads(line)
+
+
+class _OrjsonBackend:
+	name = 'orjson'
+
+	def __init__(self):
+		self.orjson = importlib.import_module('orjson')
+
+	def dumps(self, item):
+		try:
+			line = self.orjson.dumps(item, option=self.orjson.OPT_NON_STR_KEYS).decode('utf-8')
+		except TypeError:
+			# values orjson does not take: ints over 64 bits, custom key types
+			return json.dumps(item)
+		# orjson writes NaN and Infinity as null
+		return json.dumps(item) if 'null' in line and _non_finite(item) else line
+
+	def loads(self, line):
+		try:
+			return self.orjson.loads(line)
+		except ValueError:
+			# NaN / Infinity literals written by json.dumps
+			return json.loads(line)
+
+############################################################
+
 class Jsonl:
+	backends = {'json': _JsonBackend, 'orjson': _OrjsonBackend}
+	backend  = None
+
+	@classmethod
+	def use(cls, name=None):  # name=None: the default, json
+		if name is None:
+			cls.backend = _JsonBackend()
+		elif name in cls.backends:
+			cls.backend = cls.backends[name]()
+		else:
+			raise Exception(f'Unknown json backend "{name}", expected one of {list(cls.backends)}')
+		return cls.backend
+
+	@classmethod
+	def _backend(cls):
+		return cls.backend or cls.use()
+
 	@classmethod
 	def _traverse(cls, data, f):
 		if isinstance(data, dict):
@@ -20,27 +120,127 @@ class Jsonl:
 	@classmethod
 	def _escape(cls, data):
 		return cls._traverse(data, lambda s: s.replace('\n', '\\n'))
-	
+
 	@classmethod
 	def _unescape(cls, data):
 		return cls._traverse(data, lambda s: s.replace('\\n', '\n'))
 
+	@staticmethod
+	def _where(where):  # -> [(field, test, value, needle)], needle: text a matching line contains
+		tests = []
+		for field, op, value in where or []:
+			if op not in OPS:
+				raise Exception(f'Unsupported operator: "{op}"')
+			needle = json.dumps(value, ensure_ascii=False) if op == '==' and isinstance(value, str) else None
+			tests.append((field, OPS[op], value, needle))
+		return tests
+
+	@classmethod
+	def _select(cls, lines, escaped=False, fields=None, where=None):  # -> matching records, projected to fields
+		tests   = cls._where(where)
+		needles = [needle for *_, needle in tests if needle]
+		for line in lines:
+			if needles and '\\' not in line and not all(needle in line for needle in needles):
+				continue
+			item = cls.decode(line, escaped)
+			if all(field in item and test(item[field], value) for field, test, value, _ in tests):
+				yield item if fields is None else {field: item[field] for field in fields if field in item}
+
+	@classmethod
+	def _columns(cls, lines, escaped, fields, where):  # -> [[field values]]
+		columns = [[] for _ in fields]
+		for item in cls._select(lines, escaped, None, where):
+			for column, field in zip(columns, fields):
+				column.append(item.get(field, ''))
+		return columns
+
 	@classmethod
-	def save(cls, data, location, max_size=None):
-		data = '\n'.join([cls.encode(item) for item in data])
-		Data.set(data).save(location, max_size)
+	def _parallel(cls, f, batches, workers, *args):  # f results per batch, in order
+		backend = cls._backend().name
+		return Pool.imap(f, ((batch, backend, *args) for batch in batches), workers)
+
+	@staticmethod
+	def _batches(data, batch_size):
+		data = iter(data)
+		while True:
+			batch = list(islice(data, batch_size))
+			if not batch:
+				break
+			yield batch
 
 	@classmethod
-	def load(cls, location, generator=True, http_headers=None):
+	def save(cls, data, location, max_size=None, escaped=False, workers=None, batch_size=10000):
+		if workers and workers > 1:
+			batches = cls._parallel(_encode_batch, cls._batches(data, batch_size), workers, escaped)
+			lines   = (line for batch in batches for line in batch.split('\n'))
+		else:
+			lines = (cls.encode(item, escaped) for item in data)
+		Data.set(lines).save(location, max_size)
+
+	@classmethod
+	def load(cls, location, generator=True, http_headers=None, escaped=False, workers=None, batch_size=10000, fields=None, where=None, schema=None):
+		d = Data.load(location, headers=http_headers)
+		if workers and workers > 1:
+			batches = cls._parallel(_select_batch, d.batch_gen(batch_size), workers, escaped, fields, where)
+			records = (item for batch in batches for item in batch)
+		else:
+			records = cls._select(d.line_gen, escaped, fields, where)
+		if schema:
+			schema, records = Schema.resolve(schema, records)
+			records         = map(schema.record_converter(), records)
+		return records if generator else list(records)
+
+	@classmethod
+	def to_dataframe(cls, location, fields, where=None, columnar=False, http_headers=None, escaped=False, workers=None, batch_size=10000, schema=None):
 		d = Data.load(location, headers=http_headers)
-		if generator:
-			return (cls.decode(line) for line in d.line_gen)
-		return [cls.decode(line) for line in d.line_gen]
+		if workers and workers > 1:
+			columns = [[] for _ in fields]
+			for batch in cls._parallel(_columns_batch, d.batch_gen(batch_size), workers, escaped, fields, where):
+				for column, values in zip(columns, batch):
+					column.extend(values)
+		else:
+			columns = cls._columns(d.line_gen, escaped, fields, where)
+		if schema:
+			if schema is True:
+				schema = Schema.infer(zip(*[column[:Schema.sample] for column in columns]), fields)
+			columns = [list(map(f, column)) for f, column in zip(schema.converters(fields), columns)]
+		if columnar:
+			from .columnar import ColumnarDataFrame
+			if schema:
+				columns = [schema.column(f, c) for f, c in zip(fields, columns)]
+			return ColumnarDataFrame.from_columns(fields, columns)
+		from .data_frame import DataFrame
+		return DataFrame(fields)._extend(columns, len(columns[0]) if columns else 0)
 
 	@classmethod
-	def encode(cls, item):
-		return json.dumps(cls._escape(item))
+	def encode(cls, item, escaped=False):
+		if escaped:
+			return json.dumps(cls._escape(item))
+		return cls._backend().dumps(item)
 
 	@classmethod
-	def decode(cls, line):
-		return cls._unescape(json.loads(line.strip()))
\ No newline at end of file
+	def decode(cls, line, escaped=False):
+		if escaped:
+			return cls._unescape(json.loads(line.strip()))
+		return cls._backend().loads(line)
+
+############################################################
+
+def _use(backend):
+	if Jsonl.backend is None or Jsonl.backend.name != backend:
+		Jsonl.use(backend)
+
+def _encode_batch(task):  # -> "\n" joined lines of a batch
+	items, backend, escaped = task
+	_use(backend)
+	return '\n'.join(Jsonl.encode(item, escaped) for item in items)
+
+def _select_batch(task):
+	lines, backend, escaped, fields, where = task
+	_use(backend)
+	return list(Jsonl._select(lines, escaped, fields, where))
+
+def _columns_batch(task):
+	lines, backend, escaped, fields, where = task
+	_use(backend)
+	return Jsonl._columns(lines, escaped, fields, where)
@@ -0,0 +1,178 @@
+import os
+import json
+import mmap
+import array
+import hashlib
+import tempfile
+
+from .remote import RemoteReader
+
+__all__ = ['LineIndex']
+
+
+'''
+Byte offsets of every line of a text package, built on first use and cached
+
+mypackage.jsonl/lines.idx   for packages
+mypackage.jsonl.idx         for single files
+<tmp>/puerml_index/<hash>   for remote locations, and local ones in read-only directories
+
+First line: json {"parts": [[name, size, lines, version], ...]}, then the
+int64 offsets of every part (lines + 1 values, the last one is the part size).
+
+version is the mtime of a local part, the manifest checksum of a remote
+package part or the ETag / Last-Modified of a remote file. An index is used
+only while every part still has its size and version.
+'''
+
+class LineIndex:
+	name = 'lines.idx'
+
+	def __init__(self, location, parts, offsets, headers=None):
+		self.location = location
+		self.parts    = parts    # [[name, size, lines, version]]
+		self.offsets  = offsets  # [array('q')]
+		self.headers  = headers
+		self.starts   = []
+		self._maps    = {}
+
+		start = 0
+		for _, _, lines, _ in parts:
+			self.starts.append(start)
+			start += lines
+		self.lines = start
+
+	def __len__(self):
+		return self.lines
+
+	######################################################
+
+	@staticmethod
+	def _offsets(chunks):
+		offsets, pos = array.array('q', [0]), 0
+		for chunk in chunks:
+			i = chunk.find(b'\n')
+			while i != -1:
+				offsets.append(pos + i + 1)
+				i = chunk.find(b'\n', i + 1)
+			pos += len(chunk)
+		if offsets[-1] != pos:
+			offsets.append(pos)
+		return offsets
+
+	@staticmethod
+	def _paths(location):  # -> index paths, next to the data first
+		remote = location.startswith('http')
+		key    = hashlib.sha1((location if remote else os.path.abspath(location)).encode('utf-8')).hexdigest()
+		tmp    = os.path.join(tempfile.gettempdir(), 'puerml_index', key)
+		if remote:
+			return [tmp]
+		if os.path.isdir(location):
+			return [os.path.join(location, LineIndex.name), tmp]
+		return [location + '.idx', tmp]
+
+	@staticmethod
+	def _version(reader, name):  # -> version of part name, see above
+		if reader.is_local:
+			return os.stat(os.path.join(reader.location, name) if name else reader.location).st_mtime_ns
+		manifest = reader._load_manifest()
+		if manifest is not None:
+			return manifest.parts[int(name)]['checksum']
+		return RemoteReader(reader.headers).validator(f'{reader.location}/{name}' if name else reader.location)
+
+	@staticmethod
+	def _part_files(reader):  # -> [(name, bytes chunks generator)]
+		for file in reader.file_gen():
+			if reader.is_local:
+				with open(file.name, 'rb') as f:
+					name = os.path.relpath(file.name, reader.location) if os.path.isdir(reader.location) else ''
+					yield name, LineIndex._version(reader, name), iter(lambda: f.read(1024**2), b'')
+			else:
+				name = file.url[len(reader.location):].lstrip('/')
+				yield name, LineIndex._version(reader, name), file.iter_content(1024**2)
+
+	@staticmethod
+	def build(reader):
+		parts, offsets = [], []
+		for name, version, chunks in LineIndex._part_files(reader):
+			o = LineIndex._offsets(chunks)
+			parts.append([name, o[-1], len(o) - 1, version])
+			offsets.append(o)
+		return LineIndex(reader.location, parts, offsets, reader.headers)
+
+	def save(self):  # next to the data, in the temporary directory when that is not writable
+		for path in self._paths(self.location):
+			tmp = f'{path}.{os.getpid()}.tmp'
+			try:
+				os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+				with open(tmp, 'wb') as f:
+					f.write(json.dumps({'parts': self.parts}).encode('utf-8') + b'\n')
+					for o in self.offsets:
+						f.write(o.tobytes())
+				os.replace(tmp, path)
+				return self
+			except OSError:
+				if os.path.exists(tmp):
+					os.remove(tmp)
+		return self
+
+	@staticmethod
+	def _valid(reader, parts):
+		manifest = reader._load_manifest()
+		if manifest is not None and len(manifest.parts) != len(parts):
+			return False
+		for part in parts:
+			if len(part) != 4 or part[3] is None:
+				return False
+			name, size, _, version = part
+			if reader.is_local:
+				path = os.path.join(reader.location, name) if name else reader.location
+				if not os.path.isfile(path) or os.path.getsize(path) != size:
+					return False
+			if LineIndex._version(reader, name) != version:
+				return False
+		return True
+
+	@staticmethod
+	def load(reader):  # cached index or a freshly built one
+		for path in LineIndex._paths(reader.location):
+			if not os.path.isfile(path):
+				continue
+			with open(path, 'rb') as f:
+				parts = json.loads(f.readline())['parts']
+				if LineIndex._valid(reader, parts):
+					offsets = []
+					for _, _, lines, _ in parts:
+						o = array.array('q')
+						o.frombytes(f.read(8 * (lines + 1)))
+						offsets.append(o)
+					return LineIndex(reader.location, parts, offsets, reader.headers)
+		return LineIndex.build(reader).save()
+
+	######################################################
+
+	def _read(self, n, start, end):  # bytes of part n
+		name = self.parts[n][0]
+		if self.location.startswith('http'):
+			url = f'{self.location}/{name}' if name else self.location
+			return RemoteReader(self.headers).fetch_range(url, start, end)
+		if n not in self._maps:
+			path = os.path.join(self.location, name) if name else self.location
+			with open(path, 'rb') as f:
+				self._maps[n] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.parts[n][1] else b''
+		return self._maps[n][start:end]
+
+	def read(self, start, stop):  # -> [str], lines [start, stop)
+		start, stop = max(start, 0), min(stop, self.lines)
+		lines = []
+		for n, first in enumerate(self.starts):
+			count = self.parts[n][2]
+			lo, hi = max(start, first), min(stop, first + count)
+			if lo >= hi:
+				continue
+			o     = self.offsets[n]
+			base  = o[lo - first]
+			block = self._read(n, base, o[hi - first])
+			for i in range(lo - first, hi - first):
+				lines.append(block[o[i] - base:o[i + 1] - base].decode('utf-8'))
+		return lines
@@ -0,0 +1,126 @@
+import os
+import io
+import re
+import csv
+import mmap
+
+from puerml.util import Pool
+
+__all__ = ['ParallelLoader']
+
+
+'''
+Parallel csv/tsv parsing for local files.
+
+Package parts (mypackage.csv/0, /1, ...) are parsed one part per task,
+DataFrame.save keeps quoted multi-line records inside one part. A single
+file is split in byte ranges ending on record boundaries. A range without
+quotes ends after the line of its split point, otherwise records are
+matched from the start of the range with the rules of csv.reader: a quote
+opens a field only at the start of the field, elsewhere it is a character.
+
+Workers send back one "\\0" joined string per column instead of a pickled
+list of rows, the parent splits them back and merges tasks in order.
+'''
+
+SEP = '\0'
+
+def _pack(column):
+	s = SEP.join(column)
+	if s.count(SEP) == len(column) - 1:
+		return s
+	return column
+
+def _unpack(column, size):
+	if isinstance(column, list):
+		return column
+	return column.split(SEP) if size else []
+
+def _parse(task):
+	path, start, end, delimiter, encoding, skip_header, width = task
+	with open(path, 'rb') as f:
+		f.seek(start)
+		text = f.read(end - start if end is not None else -1).decode(encoding)
+
+	reader = csv.reader(io.StringIO(text), delimiter=delimiter)
+	if skip_header:
+		next(reader, None)
+
+	columns = [[] for _ in range(width)]
+	size    = 0
+	for row in reader:
+		for n in range(width):
+			columns[n].append(row[n] if n < len(row) else '')
+		size += 1
+	return size, [_pack(column) for column in columns]
+
+############################################################
+
+class ParallelLoader:
+	def __init__(self, location, delimiter, encoding='utf-8', workers=None):
+		self.location  = location
+		self.delimiter = delimiter
+		self.encoding  = encoding
+		self.workers   = workers or os.cpu_count() or 1
+
+	def _parts(self):
+		if os.path.isdir(self.location):
+			parts = []
+			while os.path.exists(os.path.join(self.location, str(len(parts)))):
+				parts.append(os.path.join(self.location, str(len(parts))))
+			if not parts:
+				raise FileNotFoundError(self.location)
+			return parts
+		return [self.location]
+
+	def _patterns(self):  # -> whole records up to endpos, one record
+		d      = re.escape(self.delimiter.encode(self.encoding))
+		field  = rb'(?:"(?:[^"]|"")*+"[^' + d + rb'\r\n]*+|[^"' + d + rb'\r\n][^' + d + rb'\r\n]*+|)'
+		fields = field + rb'(?:' + d + field + rb')*+'
+		return re.compile(rb'(?:' + fields + rb'(?:\r\n?|\n))*+'), re.compile(fields + rb'(?:\r\n?|\n|\Z)')
+
+	def _ranges(self, path):
+		size = os.path.getsize(path)
+		if not size:
+			return [(0, 0)]
+		step             = max(size // self.workers, 1)
+		records, record  = self._patterns()
+		ranges, start    = [], 0
+		with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+			while start < size:
+				split = start + step
+				if split >= size:
+					end = size
+				else:
+					line = start if data.find(b'"', start, split) != -1 else data.rfind(b'\n', start, split) + 1 or start
+					last = record.match(data, records.match(data, line, split).end())
+					end  = last.end() if last else size  # a quoted field open up to the end
+				ranges.append((start, end))
+				start = end
+		return ranges
+
+	def read_header(self):
+		with open(self._parts()[0], 'r', encoding=self.encoding) as f:
+			return next(csv.reader(f, delimiter=self.delimiter), [])
+
+	def tasks(self, width):
+		parts = self._parts()
+		if len(parts) == 1:
+			ranges = [(parts[0], start, end) for start, end in self._ranges(parts[0])]
+		else:
+			ranges = [(part, 0, None) for part in parts]
+		return [
+			(path, start, end, self.delimiter, self.encoding, n == 0, width)
+			for n, (path, start, end) in enumerate(ranges)
+		]
+
+	def column_gen(self, width):  # -> size, [column values], in file order
+		tasks = self.tasks(width)
+		if self.workers == 1 or len(tasks) == 1:
+			results = map(_parse, tasks)
+			for size, columns in results:
+				yield size, [_unpack(column, size) for column in columns]
+		else:
+			with Pool.executor(self.workers) as executor:
+				for size, columns in executor.map(_parse, tasks):
+					yield size, [_unpack(column, size) for column in columns]
@@ -0,0 +1,110 @@
+import os
+import json
+import bisect
+import hashlib
+
+from .remote import RemoteReader
+
+__all__ = ['Manifest']
+
+
+'''
+Package manifest, written by DataWriter.write_package next to the parts
+
+mypackage.jsonl/manifest.json
+{
+	"algorithm"   : "md5",
+	"binary"      : false,
+	"compression" : null,
+	"parts"       : [{"size": 1024, "checksum": "...", "lines": 10, "start": 0}, ...]
+}
+
+"lines" is the number of lines in a text part and "start" the number of
+the first line in it, both are None for binary packages. Sizes and checksums
+are of the stored (possibly compressed) parts, lines of the uncompressed text.
+'''
+
+class Manifest:
+	name = 'manifest.json'
+
+	def __init__(self, parts=None, binary=False, algorithm='md5', compression=None):
+		self.parts       = parts or []
+		self.binary      = binary
+		self.algorithm   = algorithm
+		self.compression = compression
+
+	@property
+	def size(self):
+		return sum(part['size'] for part in self.parts)
+
+	@property
+	def lines(self):
+		if self.binary:
+			return None
+		return sum(part['lines'] for part in self.parts)
+
+	def checksum(self, data):
+		return hashlib.new(self.algorithm, data).hexdigest()
+
+	def keys(self):  # -> content keys of the parts, see Cache
+		return [f'{self.algorithm}-{part["checksum"]}' for part in self.parts]
+
+	######################################################
+
+	def add(self, chunk, stored=None):  # stored: bytes written for the chunk, when compressed
+		data   = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+		stored = memoryview(data if stored is None else stored)
+		part   = {'size': stored.nbytes, 'checksum': self.checksum(stored), 'lines': None, 'start': None}
+		if not self.binary:
+			last          = self.parts[-1] if self.parts else None
+			part['lines'] = data.count(b'\n') + (0 if not data or data.endswith(b'\n') else 1)
+			part['start'] = last['start'] + last['lines'] if last else 0
+		self.parts.append(part)
+		return part
+
+	def save(self, location):
+		with open(os.path.join(location, self.name), 'w') as f:
+			json.dump({
+				'algorithm'   : self.algorithm,
+				'binary'      : self.binary,
+				'compression' : self.compression,
+				'parts'       : self.parts,
+			}, f)
+		return self
+
+	@staticmethod
+	def load(location, headers=None):  # -> Manifest | None
+		path = os.path.join(location, Manifest.name)
+		if location.startswith('http'):
+			part = RemoteReader(headers).fetch(path)
+			if part is None:
+				return None
+			data = part.content
+			part.close()
+		elif os.path.isfile(path):
+			with open(path, 'rb') as f:
+				data = f.read()
+		else:
+			return None
+		meta = json.loads(data)
+		return Manifest(meta['parts'], meta.get('binary', False), meta.get('algorithm', 'md5'), meta.get('compression'))
+
+	######################################################
+
+	def check_size(self, n, size):
+		if size != self.parts[n]['size']:
+			raise Exception(f'Package part {n} is {size} bytes, manifest expects {self.parts[n]["size"]}')
+
+	def verify(self, n, data):
+		self.check_size(n, len(data))
+		if self.checksum(data) != self.parts[n]['checksum']:
+			raise Exception(f'Package part {n} checksum mismatch')
+
+	def locate(self, line):  # -> part number, line number inside the part
+		if self.binary:
+			raise Exception('Binary packages have no lines')
+		starts = [part['start'] for part in self.parts]
+		n      = bisect.bisect_right(starts, line) - 1
+		if n < 0 or line >= self.lines:
+			raise IndexError(f'Line {line} is out of range')
+		return n, line - starts[n]
@@ -0,0 +1,237 @@
+import io
+import os
+import tempfile
+
+from collections import deque
+from puerml.util import Pool
+
+from .cache import Cache
+
+__all__ = ['RemotePart', 'RemoteReader']
+
+
+class RemotePart:
+	# Downloaded package part, spooled to disk above RemoteReader.spool_size.
+	# Mirrors the parts of requests.Response DataReader relies on.
+	def __init__(self, url, file):
+		self.url  = url
+		self.file = file
+		self.file.seek(0)
+
+	@property
+	def size(self):
+		position = self.file.tell()
+		self.file.seek(0, os.SEEK_END)
+		size = self.file.tell()
+		self.file.seek(position)
+		return size
+
+	@property
+	def content(self):
+		self.file.seek(0)
+		return self.file.read()
+
+	def head(self, size):
+		self.file.seek(0)
+		data = self.file.read(size)
+		self.file.seek(0)
+		return data
+
+	def read(self, size=-1):
+		return self.file.read(size)
+
+	def readinto(self, buffer):
+		return self.file.readinto(buffer)
+
+	def iter_content(self, chunk_size=1024):
+		self.file.seek(0)
+		while True:
+			chunk = self.file.read(chunk_size)
+			if not chunk:
+				break
+			yield chunk
+
+	def iter_lines(self, decode_unicode=False):
+		self.file.seek(0)
+		if not decode_unicode:
+			for line in self.file:
+				yield line.rstrip(b'\r\n')
+			return
+		text = io.TextIOWrapper(self.file, encoding='utf-8', newline=None)
+		try:
+			for line in text:
+				yield line.rstrip('\n')
+		finally:
+			text.detach()
+
+	def close(self):
+		self.file.close()
+
+############################################################
+
+class RemoteReader:
+	pool_size  = 16
+	read_ahead = 4
+	retries    = 3
+	timeout    = 60
+	chunk_size = 1024**2
+	spool_size = 64 * 1024**2
+	_session   = None
+
+	def __init__(self, headers=None, read_ahead=None):
+		self.headers    = headers or {}
+		self.read_ahead = read_ahead or RemoteReader.read_ahead
+
+	@classmethod
+	def session(cls):
+		if cls._session is None:
+			import requests  # slow to import, only remote reads need it
+			from requests.adapters import HTTPAdapter
+			adapter = HTTPAdapter(pool_connections=cls.pool_size, pool_maxsize=cls.pool_size)
+			session = requests.Session()
+			session.mount('http://', adapter)
+			session.mount('https://', adapter)
+			cls._session = session
+		return cls._session
+
+	def _download(self, url, file, headers=None):  # -> response, None if url is missing
+		import requests
+		headers = {**self.headers, **(headers or {})}
+		offset  = file.tell()
+		if offset:
+			headers['Range'] = f'bytes={offset}-'
+
+		with self.session().get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+			if response.status_code == 304:
+				return response
+			if response.status_code == 200:
+				file.seek(0)
+				file.truncate()
+			elif response.status_code != 206:
+				return None
+
+			# keep what was received on a dropped connection, the length check below resumes it
+			response.raw.enforce_content_length = False
+			expected = response.headers.get('Content-Length')
+			received = 0
+			for chunk in response.iter_content(chunk_size=self.chunk_size):
+				file.write(chunk)
+				received += len(chunk)
+			if expected is not None and received < int(expected):
+				raise requests.ConnectionError(f'Incomplete read of "{url}": {received} of {expected} bytes')
+		return response
+
+	def _fetch(self, url, file, headers=None):  # -> response, None if url is missing
+		import requests
+		attempt = 0
+		while True:
+			try:
+				return self._download(url, file, headers)
+			except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+				attempt += 1
+				if attempt > self.retries:
+					raise
+
+	def _fetch_cached(self, cache, url, key):
+		entry, cached = None, None
+		if key:
+			cached = cache.open(key)
+			if cached:
+				return RemotePart(url, cached)
+		else:
+			entry, cached = cache.lookup(url)
+
+		file = cache.temp()
+		try:
+			response = self._fetch(url, file, cache.conditional(entry) if cached else None)
+		except BaseException:
+			cache.discard(file)
+			if cached: cached.close()
+			raise
+		if response is None or response.status_code == 304:
+			cache.discard(file)
+			return RemotePart(url, cached) if response is not None else None
+		if cached:
+			cached.close()
+		cache.store(file, url, key, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+		return RemotePart(url, file)
+
+	def fetch(self, url, key=None):  # -> RemotePart | None, key: content key of the url, see Cache
+		cache = Cache.current()
+		if cache is not None:
+			return self._fetch_cached(cache, url, key)
+		file = tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+		try:
+			response = self._fetch(url, file)
+		except BaseException:
+			file.close()
+			raise
+		if response is None:
+			file.close()
+			return None
+		return RemotePart(url, file)
+
+	def fetch_range(self, url, start, end):  # -> bytes [start, end)
+		if end <= start:
+			return b''
+		headers = dict(self.headers)
+		headers['Range'] = f'bytes={start}-{end - 1}'
+		response = self.session().get(url, headers=headers, timeout=self.timeout)
+		if response.status_code == 206:
+			return response.content[:end - start]
+		if response.status_code == 200:
+			return response.content[start:end]
+		raise Exception(f'Failed to read "{url}": HTTP {response.status_code}')
+
+	def validator(self, url):  # -> ETag or Last-Modified of url, None if the server sends neither
+		response = self.session().head(url, headers=self.headers, timeout=self.timeout, allow_redirects=True)
+		if response.status_code != 200:
+			return None
+		return response.headers.get('ETag') or response.headers.get('Last-Modified')
+
+	@staticmethod
+	def _discard(futures):
+		for future in futures:
+			if future.cancel():
+				continue
+			try:
+				part = future.result()
+			except Exception:
+				continue
+			if part is not None:
+				part.close()
+
+	def part_gen(self, location, start=0, count=None, keys=None):  # parts downloaded read_ahead at a time, yielded in order
+		executor = Pool.executor(self.read_ahead, 'thread')
+		futures  = deque()
+		n        = start
+
+		def submit():
+			nonlocal n
+			if count is None or n < count:
+				futures.append(executor.submit(self.fetch, os.path.join(location, str(n)), keys[n] if keys else None))
+				n += 1
+
+		try:
+			for _ in range(self.read_ahead):
+				submit()
+
+			while futures:
+				part = futures.popleft().result()
+				if part is None:
+					if count is not None:
+						raise FileNotFoundError(f'Package part {n - len(futures) - 1} of "{location}" is missing')
+					if n - len(futures) == 1:
+						# Reading single file
+						part = self.fetch(location)
+						if part is None:
+							raise FileNotFoundError(f'{os.path.join(location, "0")} or {location}')
+						yield part
+						part.close()
+					break
+				submit()
+				yield part
+				part.close()
+		finally:
+			self._discard(futures)
+			executor.shutdown(wait=False)
@@ -0,0 +1,110 @@
+from .data_frame    import DataFrame, DataFrameRow
+from .external_sort import ExternalSort
+from .group_by      import GroupBy
+
+__all__ = ['DataFrameScan']
+
+
+'''
+Lazy query plan over a csv/tsv location. Every chained call returns a new
+plan, nothing is read until a terminal call (collect, to_list, save, iteration),
+which then runs all steps in a single pass over Data.line_gen.
+
+DataFrame.scan('big.tsv')
+	.filter(lambda row, n: row.get('country') == 'UA')
+	.alter(['id', 'name'])
+	.save('ua.tsv', max_size)
+'''
+
+class DataFrameScan:
+	def __init__(self, location, http_headers=None, steps=None):
+		self.location     = location
+		self.http_headers = http_headers
+		self.steps        = steps or []
+
+	def _then(self, step):
+		return DataFrameScan(self.location, self.http_headers, self.steps + [step])
+
+	@staticmethod
+	def _wrap(header, rows):
+		df = DataFrame(header)
+		return (DataFrameRow(row, df=df) for row in rows)
+
+	def _run(self):  # -> header, rows generator
+		header, rows = DataFrame._read(self.location, self.http_headers)
+		rows = self._wrap(header, rows)
+		for step in self.steps:
+			header, rows = step(header, rows)
+		return header, rows
+
+	######################################################
+
+	def filter(self, f):  # f(row, n)
+		def step(header, rows):
+			return header, (row for n, row in enumerate(rows) if f(row, n))
+		return self._then(step)
+
+	def alter(self, cols):
+		def step(header, rows):
+			return cols, self._wrap(cols, ([row.get(col) for col in cols] for row in rows))
+		return self._then(step)
+
+	def map_col(self, col, f):
+		def step(header, rows):
+			def gen():
+				for row in rows:
+					row.set(col, f(row.get(col)))
+					yield row
+			return header, gen()
+		return self._then(step)
+
+	def map_cols(self, cols, f):
+		plan = self
+		for col in cols:
+			plan = plan.map_col(col, f)
+		return plan
+
+	def cast(self, col, _type=str):
+		return self.map_col(col, _type)
+
+	def transform(self, header, f):
+		def step(_, rows):
+			return header, self._wrap(header, (f(row) for row in rows))
+		return self._then(step)
+
+	def sort_by(self, cols, asc=True, max_rows=1000000, tmp_dir=None):
+		def step(header, rows):
+			return header, self._wrap(header, ExternalSort(header, cols, asc, max_rows, tmp_dir=tmp_dir).sort(rows))
+		return self._then(step)
+
+	def group_by(self, cols, batch_size=10000, columnar=False):
+		return GroupBy(self, cols, batch_size, columnar)
+
+	######################################################
+
+	def __iter__(self):
+		_, rows = self._run()
+		return rows
+
+	def collect(self, columnar=False):
+		header, rows = self._run()
+		df = DataFrame._create(header, columnar)
+		for row in rows:
+			df.append(row)
+		return df
+
+	def top(self, k, cols, asc=True, columnar=False):
+		header, rows = self._run()
+		df = DataFrame._create(header, columnar)
+		for row in ExternalSort(header, cols, asc).top(rows, k):
+			df.append(row)
+		return df
+
+	def to_list(self, col, _type=str):
+		_, rows = self._run()
+		return [_type(row.get(col)) for row in rows]
+
+	def save(self, location, max_size=None):
+		header, rows = self._run()
+		DataFrame._write(location, header, rows, max_size)
+		return self
@@ -0,0 +1,175 @@
+import re
+import sys
+import json
+
+from datetime  import datetime
+from itertools import chain, islice
+
+from .columns import Column, BoolColumn, IntColumn, FloatColumn, StrColumn, ObjectColumn
+
+__all__ = ['Schema']
+
+
+'''
+Column types inferred from a sample of records or rows
+
+schema = Schema.infer(records)                        dicts, e.g. Jsonl records
+schema = Schema.infer(rows, header)                   lists, e.g. csv rows
+schema.types                                          {field: kind}
+
+DataFrame.load('mytable.csv', schema=True)            typed columns, inferred from the first rows
+Jsonl.load('mypackage.jsonl', schema=schema)          records with parsed values
+
+kinds: int, float, bool, datetime, category, json, str, object
+
+Strings are parsed into the field kind, values that do not parse are kept
+as they are. Missing values ('' or None) are not sampled, an int field with
+missing values is float and missing floats are nan. category is a str field
+with few distinct values: one shared string per value, a StrColumn in
+columnar frames. object is a field with mixed non string values. Numbers
+with leading zeros ('007', '02134') are codes and stay strings.
+'''
+
+class Schema:
+	sample         = 1000
+	category_ratio = 0.5  # distinct / sampled values at most
+	column_types   = {'int': IntColumn, 'float': FloatColumn, 'bool': BoolColumn, 'str': StrColumn, 'category': StrColumn}
+	_int           = re.compile(r'[+-]?(0|[1-9]\d*)')  # no leading zeros: '007' is a code, not 7
+	_float         = re.compile(r'[+-]?((0|[1-9]\d*)(\.\d*)?|\.\d+)([eE][+-]?\d+)?')
+	_bools         = {'true': True, 'false': False}
+	_parsers       = {
+		'int'      : int,
+		'float'    : float,
+		'bool'     : lambda value: Schema._bools[value.lower()],
+		'datetime' : datetime.fromisoformat,
+		'json'     : json.loads,
+		'category' : sys.intern,
+	}
+
+	def __init__(self, types):
+		self.types = dict(types)
+
+	def __repr__(self):
+		return f'Schema({self.types})'
+
+	@staticmethod
+	def _missing(value):
+		return value is None or value == ''
+
+	@staticmethod
+	def _kind(value):  # -> kind of a single value
+		if isinstance(value, bool):
+			return 'bool'
+		if isinstance(value, int):
+			return 'int'
+		if isinstance(value, float):
+			return 'float'
+		if isinstance(value, (dict, list)):
+			return 'json'
+		if not isinstance(value, str):
+			return 'object'
+		if value.lower() in Schema._bools:
+			return 'bool'
+		if Schema._int.fullmatch(value):
+			return 'int'
+		if Schema._float.fullmatch(value):
+			return 'float'
+		if value[0] in '{[':
+			try:
+				json.loads(value)
+				return 'json'
+			except ValueError:
+				pass
+		if value[0].isdigit():
+			try:
+				datetime.fromisoformat(value)
+				return 'datetime'
+			except ValueError:
+				pass
+		return 'str'
+
+	@staticmethod
+	def _merge(values, missing):  # -> kind of sampled field values
+		kinds = {Schema._kind(value) for value in values}
+		if len(kinds) > 1:
+			kinds = {'float'} if kinds == {'int', 'float'} else {'str' if all(isinstance(v, str) for v in values) else 'object'}
+		kind = kinds.pop() if kinds else 'str'
+		if kind == 'int' and missing:
+			return 'float'
+		if kind == 'str' and values and len(set(values)) <= len(values) * Schema.category_ratio:
+			return 'category'
+		return kind
+
+	@staticmethod
+	def infer(rows, header=None, sample=None):  # rows: dicts, or lists with header
+		values  = {}
+		missing = set()
+		for row in islice(rows, sample or Schema.sample):
+			for field, value in row.items() if header is None else zip(header, row):
+				field_values = values.setdefault(field, [])
+				if Schema._missing(value):
+					missing.add(field)
+				else:
+					field_values.append(value)
+			if header is not None and len(row) < len(header):
+				missing.update(header[len(row):])
+		if header is not None:
+			values = {field: values.get(field, []) for field in header}
+		return Schema({field: Schema._merge(v, field in missing) for field, v in values.items()})
+
+	@staticmethod
+	def resolve(schema, rows, header=None):  # -> schema, rows; schema=True infers it from the head of rows
+		if schema is True:
+			rows   = iter(rows)
+			head   = list(islice(rows, Schema.sample))
+			schema = Schema.infer(head, header)
+			rows   = chain(head, rows)
+		return schema, rows
+
+	######################################################
+
+	def converter(self, field):  # -> f(value), None if values are kept as they are
+		kind  = self.types.get(field)
+		parse = self._parsers.get(kind)
+		if parse is None:
+			return None
+		nan = float('nan')
+
+		def convert(value):
+			if type(value) is not str or value == '':
+				if kind == 'float':
+					if value is None or value == '':
+						return nan
+					if type(value) is int:
+						return float(value)
+				return value
+			try:
+				return parse(value)
+			except (ValueError, KeyError):
+				return value
+		return convert
+
+	def converters(self, fields):  # -> [f(value)], positional
+		return [self.converter(field) or (lambda value: value) for field in fields]
+
+	@staticmethod
+	def convert_row(row, converters):
+		return [f(value) for f, value in zip(converters, row)] + row[len(converters):]
+
+	def record_converter(self):  # -> f(item), converts in place
+		converters = [(field, f) for field in self.types for f in [self.converter(field)] if f]
+
+		def convert(item):
+			for field, f in converters:
+				if field in item:
+					item[field] = f(item[field])
+			return item
+		return convert
+
+	def column(self, field, values=()):  # -> typed Column of converted values
+		column = self.column_types.get(self.types.get(field), ObjectColumn)()
+		try:
+			column.extend(values)
+		except TypeError:
+			return Column.infer(values)
+		return column
@@ -1,3 +1,4 @@
 from .file import File
+from .pool import Pool
 
-__all__ = ['File']
\ No newline at end of file
+__all__ = ['File', 'Pool']
\ No newline at end of file
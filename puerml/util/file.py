@@ -1,9 +1,13 @@
+import io
 import os
+import errno
 import shutil
 
 __all__ = ['File']
 
 class File:
+	block_size = 1024**2
+
 	@staticmethod
 	def rm(path):
 		if os.path.exists(path):
@@ -11,3 +15,43 @@ class File:
 				shutil.rmtree(path)
 			else:
 				os.remove(path)
+
+	@staticmethod
+	def _copy_fd(source, target):  # -> False if the kernel can not copy between these files
+		if not isinstance(source, (io.BufferedReader, io.FileIO)) or not isinstance(target, (io.BufferedWriter, io.FileIO)):
+			return False
+		target.flush()
+		src, dst = source.fileno(), target.fileno()
+		offset   = source.tell()
+		copied   = 0
+		while True:
+			try:
+				if hasattr(os, 'copy_file_range'):
+					n = os.copy_file_range(src, dst, 1 << 30, offset)
+				else:
+					n = os.sendfile(dst, src, offset, 1 << 30)
+			except OSError as e:
+				if copied == 0 and e.errno in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF):
+					return False
+				raise
+			if n == 0:
+				break
+			offset += n
+			copied += n
+		source.seek(offset)
+		return True
+
+	@staticmethod
+	def copy(source, target, block_size=None):  # file objects, zero-copy between local binary files
+		block_size = block_size or File.block_size
+		if File._copy_fd(source, target):
+			return
+		if isinstance(source, io.TextIOBase) or not hasattr(source, 'readinto'):
+			shutil.copyfileobj(source, target, block_size)
+			return
+		buffer = memoryview(bytearray(block_size))
+		while True:
+			n = source.readinto(buffer)
+			if not n:
+				break
+			target.write(buffer[:n])
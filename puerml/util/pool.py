@@ -0,0 +1,40 @@
+import pickle
+
+from collections import deque
+
+__all__ = ['Pool']
+
+class Pool:
+	kinds = {'process': 'ProcessPoolExecutor', 'thread': 'ThreadPoolExecutor'}  # loaded on first use
+
+	@staticmethod
+	def executor(workers, kind='process'):
+		if kind not in Pool.kinds:
+			raise Exception(f'Unsupported pool "{kind}", expected one of {list(Pool.kinds)}')
+		import concurrent.futures  # slow to import (logging), loaded with the first pool
+		return getattr(concurrent.futures, Pool.kinds[kind])(max_workers=workers)
+
+	@staticmethod
+	def _check(f, kind):  # a function the process pool can not pickle fails on submit and leaves workers behind
+		if kind != 'process':
+			return
+		try:
+			pickle.dumps(f)
+		except (pickle.PicklingError, AttributeError, TypeError) as e:
+			raise Exception(f'Process pool needs a picklable function, use pool "thread" for lambdas and local functions ({e})')
+
+	@staticmethod
+	def imap(f, items, workers, kind='process', prefetch=None):  # f(item) results in order, at most prefetch in flight
+		Pool._check(f, kind)
+		prefetch = prefetch or 2 * workers
+		executor = Pool.executor(workers, kind)
+		futures  = deque()
+		try:
+			for item in items:
+				futures.append(executor.submit(f, item))
+				if len(futures) >= prefetch:
+					yield futures.popleft().result()
+			while futures:
+				yield futures.popleft().result()
+		finally:
+			executor.shutdown(wait=True, cancel_futures=True)  # running items finish, the rest are dropped
@@ -0,0 +1,81 @@
+import os
+import sys
+import json
+import array
+
+from puerml  import ColumnStore, ColumnarDataFrame, DataFrame
+from pytest  import fixture
+
+
+class TestColumnStore:
+	@fixture(autouse=True, scope='class', name='setup_TestColumnStore')
+	def setup(cls, request, tmp_path_factory):
+		request.cls.location = os.path.join(str(tmp_path_factory.mktemp('column_store_test_dir')), 'test.pcol')
+		request.cls.header   = ['id', 'city', 'score', 'extra']
+		request.cls.rows     = [[i, f'city{i % 4}', i / 2, '' if i % 5 else 'x'] for i in range(100)]
+
+	def _df(self):
+		return ColumnarDataFrame(self.header, self.rows)
+
+	def test_round_trip(self):
+		self._df().save(self.location, 256)
+		assert len([f for f in os.listdir(self.location) if f.isdigit()]) > 1
+		df = DataFrame.load(self.location, columnar=True)
+		assert [c.kind for c in df.columns] == ['int', 'str', 'float', 'str']
+		assert [list(row) for row in df] == self.rows
+
+	def test_mapped_without_copy(self):
+		self._df().save(self.location)
+		df = ColumnStore.load(self.location)
+		assert isinstance(df.columns[0].data, memoryview)
+		assert isinstance(df.columns[1].data, memoryview)
+		df.set('id', 0, 42)
+		assert df.get('id', 0) == 42
+		assert not isinstance(df.columns[0].data, memoryview)
+
+	def test_projection(self):
+		self._df().save(self.location, 256)
+		df = DataFrame.load(self.location, cols=['score', 'id'])
+		assert df.header == ['score', 'id']
+		assert df.get('id', 99) == 99
+
+	def test_chunk_skipping(self):
+		self._df().save(self.location, 256)
+		df = ColumnStore.load(self.location, where=[('id', '>=', 90), ('city', '==', 'city1')])
+		assert df.to_list('id', int) == [93, 97]
+		assert ColumnStore._may_match({'min': 0, 'max': 10, 'nulls': 0}, '>', 10) is False
+		assert ColumnStore._may_match({'min': 'a', 'max': 'c', 'nulls': 0}, '==', 'b') is True
+		assert ColumnStore._may_match({'min': 'a', 'max': 'c', 'nulls': 0}, '==', '') is False
+
+	def test_where_other_type(self):
+		self._df().save(self.location, 256)
+		assert ColumnStore._may_match({'min': 0, 'max': 10, 'nulls': 0}, '>', '5') is True
+		assert len(ColumnStore.load(self.location, where=[('id', '>', '5')])) == 0
+		assert len(ColumnStore.load(self.location, where=[('city', '==', 1)])) == 0
+
+	def test_other_byteorder(self):
+		self._df().save(self.location, 256)
+		path = os.path.join(self.location, ColumnStore.schema)
+		with open(path) as f:
+			schema = json.load(f)
+		for n, chunk in enumerate(schema['chunks']):  # rewrite the store as written on the other byte order
+			with open(os.path.join(self.location, str(n)), 'r+b') as f:
+				data = bytearray(f.read())
+				for kind, meta in zip(schema['types'], chunk['columns']):
+					block = array.array({'int': 'q', 'float': 'd', 'str': 'i'}[kind])
+					block.frombytes(data[meta['offset']:meta['offset'] + meta['size']])
+					block.byteswap()
+					data[meta['offset']:meta['offset'] + meta['size']] = block.tobytes()
+				f.seek(0)
+				f.write(data)
+		schema['byteorder'] = 'big' if sys.byteorder == 'little' else 'little'
+		with open(path, 'w') as f:
+			json.dump(schema, f)
+		df = ColumnStore.load(self.location)
+		assert [list(row) for row in df] == self.rows
+
+	def test_row_frame(self):
+		DataFrame(['a', 'b'], [['1', 'x'], ['2', 'y']]).save(self.location)
+		df = DataFrame.load(self.location)
+		assert not isinstance(df, ColumnarDataFrame)
+		assert [list(row) for row in df] == [['1', 'x'], ['2', 'y']]
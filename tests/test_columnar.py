@@ -0,0 +1,77 @@
+import os
+
+from puerml  import DataFrame, ColumnarDataFrame
+from pytest  import fixture
+
+
+class TestColumnarDataFrame:
+	@fixture(autouse=True, scope='class', name='setup_TestColumnarDataFrame')
+	def setup(cls, request, tmp_path_factory):
+		request.cls.location = os.path.join(str(tmp_path_factory.mktemp('columnar_test_dir')), 'test.tsv')
+		request.cls.header   = ['name', 'city', 'age']
+		request.cls.rows     = [
+			[f'name{i}', f'city{i % 3}', str(40 - i)]
+			for i in range(10)
+		]
+
+	def _df(self):
+		return ColumnarDataFrame(self.header, self.rows)
+
+	def test_row_api(self):
+		df  = self._df()
+		row = df.rows[2]
+		assert row.get('city') == 'city2'
+		assert row.to_dict() == {'name': 'name2', 'city': 'city2', 'age': '38'}
+		row.set('city', 'paris')
+		assert df.get('city', 2) == 'paris'
+		assert df.columns[1].kind == 'str'
+
+	def test_dictionary_encoding(self):
+		df = self._df()
+		assert len(df.columns[1].values) == 3
+		assert df.to_list('city') == [f'city{i % 3}' for i in range(10)]
+
+	def test_big_ints(self):
+		df = ColumnarDataFrame(['a'], [[10**20], [-2**63]])
+		assert df.columns[0].kind == 'object' and [df.get('a', n) for n in range(2)] == [10**20, -2**63]
+		df = ColumnarDataFrame(['a'], [[1], [2**63 - 1]])
+		assert df.columns[0].kind == 'int'
+		df.append([2**63])
+		assert [df.get('a', n) for n in range(3)] == [1, 2**63 - 1, 2**63]
+		assert DataFrame(['a'], [[10**20]]).to_columnar().get('a', 0) == 10**20
+
+	def test_cast_and_map_col(self):
+		df = self._df().cast('age', int)
+		assert df.columns[2].kind == 'int'
+		assert df.to_list('age', int) == [40 - i for i in range(10)]
+		df.map_col('city', str.upper)
+		assert df.get('city', 4) == 'CITY1'
+		df.set('age', 0, 'unknown')
+		assert df.columns[2].kind == 'object'
+
+	def test_filter_and_sort_by(self):
+		df = self._df().cast('age', int)
+		df = df.filter(lambda row, n: row.get('city') == 'city0')
+		assert df.to_list('name') == ['name0', 'name3', 'name6', 'name9']
+		df.sort_by('age')
+		assert df.to_list('age', int) == [31, 34, 37, 40]
+		df.sort_by('name', asc=False)
+		assert df.to_list('name') == ['name9', 'name6', 'name3', 'name0']
+
+	def test_add_remove_col(self):
+		df = self._df()
+		df.add_col('country', 'ua', after='name')
+		assert df.header == ['name', 'country', 'city', 'age']
+		assert df.rows[5].to_dict()['country'] == 'ua'
+		df.remove_col('country')
+		assert df.header == self.header
+
+	def test_save_load(self):
+		self._df().save(self.location)
+		df = DataFrame.load(self.location, columnar=True)
+		assert isinstance(df, ColumnarDataFrame)
+		assert [list(row) for row in df] == self.rows
+
+	def test_round_trip(self):
+		df = DataFrame(self.header, self.rows).to_columnar().to_rows()
+		assert [list(row) for row in df] == self.rows
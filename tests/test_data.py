@@ -1,8 +1,12 @@
 import os
+import sys
 import hashlib
+import subprocess
 
 from puerml  import Data
-from pytest  import fixture
+from pytest  import fixture, raises
+
+from puerml.library.line_index import LineIndex
 
 
 class TestData:
@@ -93,3 +97,232 @@ class TestData:
 
 	def test_unzip_web_load_single_file(self):
 		self._unzip(self.web_location_single_file)
+
+	def test_manifest(self):
+		location = os.path.join(self.location, '..', 'manifest_test.txt')
+		lines    = [f'line {i}' for i in range(50)]
+		progress = []
+		Data.set('\n'.join(lines)).save(location, 60)
+
+		d = Data.load(location, verify=True, progress=lambda done, total: progress.append((done, total)))
+		assert d.manifest.lines == 50
+		assert len(d.manifest.parts) == len(os.listdir(location)) - 1
+		assert list(d.line_gen) == lines
+		assert progress[-1] == (len(d.manifest.parts), len(d.manifest.parts))
+		assert list(Data.load(location).lines_from(37)) == lines[37:]
+
+	def test_manifest_detects_truncation(self):
+		location = os.path.join(self.location, '..', 'manifest_truncated.txt')
+		Data.set('\n'.join(f'line {i}' for i in range(50))).save(location, 60)
+		with open(os.path.join(location, '1'), 'a') as f:
+			f.write('extra')
+		os.remove(os.path.join(location, '3'))
+		try:
+			list(Data.load(location).line_gen)
+			assert False, 'Size mismatch expected'
+		except Exception as e:
+			assert 'manifest expects' in str(e)
+		os.remove(os.path.join(location, '1'))
+		try:
+			list(Data.load(location).line_gen)
+			assert False, 'Missing part expected'
+		except FileNotFoundError:
+			pass
+
+	def test_random_access(self):
+		lines = [f'line {i}' for i in range(100)]
+		for max_size in (None, 70):
+			location = os.path.join(self.location, '..', f'random_access_{max_size}.txt')
+			Data.set('\n'.join(lines) + '\n').save(location, max_size)
+			d = Data.load(location)
+			assert d.num_lines == 100
+			assert d[0] == 'line 0' and d[-1] == 'line 99' and d[42] == 'line 42'
+			assert d[10:20] == lines[10:20]
+			assert d[5:50:7] == lines[5:50:7]
+			assert d.read_lines(95, 200) == lines[95:]
+			assert [line for i in range(3) for line in Data.load(location).shard(i, 3, 8)] == lines
+			assert Data.load(location).line_index.offsets == d.line_index.offsets
+
+	def test_random_access_revalidated(self):
+		location = os.path.join(self.location, '..', 'random_access_changed.txt')
+		Data.set('a\nb\n').save(location)
+		assert Data.load(location).num_lines == 2
+		stat = os.stat(location)
+		Data.set('a\n\nb').save(location)  # same size, new mtime
+		os.utime(location, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+		assert Data.load(location).read_lines(0) == ['a', '', 'b']
+
+	def test_random_access_read_only(self):
+		location = os.path.join(self.location, '..', 'random_access_read_only.txt')
+		Data.set('a\nb\n').save(location)
+		os.makedirs(location + '.idx')  # index path that can not be written
+		assert Data.load(location).num_lines == 2
+		assert os.path.isfile(LineIndex._paths(location)[-1])
+
+	def test_compression(self):
+		lines = [f'line {i}' for i in range(100)]
+		magic = {'gz': b'\x1f\x8b', 'bz2': b'BZh', 'xz': b'\xfd7zXZ'}
+		for name, head in magic.items():
+			for max_size in (None, 120):
+				location = os.path.join(self.location, '..', f'compressed_{max_size}.txt.{name}')
+				Data.set('\n'.join(lines)).save(location, max_size)
+				first = location if max_size is None else os.path.join(location, '0')
+				with open(first, 'rb') as f:
+					assert f.read(len(head)) == head
+				d = Data.load(location, verify=True)
+				assert list(d.line_gen) == lines
+				assert list(d.batch_gen(100))[0] == lines
+				if max_size:
+					assert d.manifest.compression == name
+					assert d.manifest.lines == 100
+
+		location = os.path.join(self.location, '..', 'compressed_explicit.bin')
+		data     = bytes(range(256)) * 40
+		Data.set(data).save(location, 1000, compression='gzip')
+		assert Data.load(location).manifest.compression == 'gz'
+		assert b''.join(Data.load(location).chunk_gen(300)) == data
+
+		location = os.path.join(self.location, '..', 'not_compressed.bin.gz')
+		Data.set(data).save(location)
+		with open(location, 'rb') as f:
+			assert f.read() == data
+		assert b''.join(Data.load(location).chunk_gen(300)) == data
+
+		try:
+			Data.set('x').save(location, compression='rar')
+			assert False, 'Unsupported compression expected'
+		except Exception as e:
+			assert 'Unsupported compression' in str(e)
+
+	def test_compressed_part_size(self):
+		lines = [f'line {i}:' + 'x' * (i % 50) for i in range(2000)]
+		for name in ('gz', 'xz'):
+			location = os.path.join(self.location, '..', f'compressed_size.txt.{name}')
+			Data.set(list(lines)).save(location, 2000, size='compressed')
+			d     = Data.load(location, verify=True)
+			parts = [part['size'] for part in d.manifest.parts]
+			assert len(parts) > 1 and max(parts) <= 2000 * 1.1 and d.manifest.size > 2000 * (len(parts) - 1) * 0.7
+			assert list(d.line_gen) == lines
+
+			Data.set(list(lines)).save(location, 2000)
+			assert len(Data.load(location).manifest.parts) > len(parts)
+
+		location = os.path.join(self.location, '..', 'compressed_size.txt')
+		Data.set(list(lines)).save(location, 2000, size='compressed')  # not compressed: the uncompressed size
+		assert max(part['size'] for part in Data.load(location).manifest.parts) <= 2000
+		assert list(Data.load(location).line_gen) == lines
+		with raises(Exception, match='Unsupported size'):
+			Data.set(list(lines)).save(location, 2000, size='stored')
+
+	def test_zip_streaming_parallel_unzip(self):
+		source = os.path.join(self.location, '..', 'zip_source')
+		target = os.path.join(self.location, '..', 'zip_target')
+		for n in range(3):
+			self._write_content(os.path.join(source, f'sub_{n}'), {f'file_{i}': os.urandom(3000 * i) for i in range(n, 12, 3)}, 'wb')
+		expected = {os.path.relpath(path, source): checksum for path, checksum in self._get_checksums(source).items()}
+
+		Data.zip(source).save(source + '.zip', 1000)
+		assert len(os.listdir(source + '.zip')) > 30
+		for workers in (1, 4):
+			Data.load(source + '.zip').unzip(target, workers)
+			assert {os.path.relpath(path, target): checksum for path, checksum in self._get_checksums(target).items()} == expected
+
+		Data.zip(source).unzip(target)
+		assert len(self._get_checksums(target)) == 12
+
+	def test_multi_part_file(self):
+		from puerml.library.archive import MultiPartFile
+		location = os.path.join(self.location, '..', 'multi_part')
+		data     = bytes(range(256)) * 10
+		Data.set(data).save(location, 300)
+		f = MultiPartFile(sorted((os.path.join(location, name) for name in os.listdir(location) if name.isdigit()), key=lambda p: int(os.path.basename(p))))
+		assert f.read() == data
+		f.seek(-1000, os.SEEK_END)
+		assert f.read(700) == data[-1000:-300] and f.tell() == len(data) - 300
+		f.seek(250)
+		assert f.read(100) == data[250:350]
+		f.close()
+
+	def test_binary_copy(self):
+		source = os.path.join(self.location, '..', 'copy_source.bin')
+		data   = os.urandom(50000)
+		self._write(source, data, 'wb')
+		for max_size in (None, 7000):
+			target = os.path.join(self.location, '..', f'copy_target_{max_size}.bin')
+			Data.load(source).save(target, max_size)
+			chunks = list(Data.load(target).chunk_gen(7000))
+			assert all(isinstance(chunk, bytes) for chunk in chunks)
+			assert b''.join(chunks) == data
+		assert Data.load(os.path.join(self.location, '..', 'copy_target_7000.bin')).manifest.parts[0]['size'] == 7000
+
+		target = os.path.join(self.location, '..', 'copy_target.bin.gz')
+		Data.load(source).save(target, compression='gz')
+		Data.load(target, compression='gz').save(source + '.copy')
+		with open(source + '.copy', 'rb') as f:
+			assert f.read() == data
+
+	def test_byte_level_text_chunks(self):
+		from puerml.library.data import DataReader
+		text     = 'plain line\n  padded \t\n\n\r\nwindows\r\nmac\rcyrillic тест\n　wide　\nno newline at end'
+		location = os.path.join(self.location, '..', 'byte_chunks.txt')
+		with open(location, 'w', newline='') as f:
+			f.write(text * 20)
+		Data.load(location).save(location + '.pkg', 64)
+
+		block_size = DataReader.block_size
+		try:
+			for DataReader.block_size in (7, 1024**2):
+				for source in (location, location + '.pkg'):
+					for max_size in (1, 10, 64, 1000):
+						old, new = DataReader.load(source), DataReader.load(source)
+						old.is_binary = new.is_binary = False
+						assert [chunk.encode('utf-8') for chunk in old._chunk_lines_gen(max_size)] == list(new._chunk_text_gen(max_size))
+		finally:
+			DataReader.block_size = block_size
+
+	def test_byte_level_chunks_of_unstripped_package(self):
+		from puerml.library.data import DataReader
+		location = os.path.join(self.location, '..', 'unstripped.txt')
+		Data.set(iter(['  a  ', 'b\t', ' c'])).save(location, 100)
+		old, new = DataReader.load(location), DataReader.load(location)
+		assert list(new._chunk_text_gen(4)) == [b'a\nb\nc']
+		assert [chunk.encode('utf-8') for chunk in old._chunk_lines_gen(4)] == [b'a\nb\nc']
+
+	def test_batch_gen(self):
+		lines    = [str(i) for i in range(103)]
+		location = os.path.join(self.location, '..', 'batches.txt')
+		Data.set(lines).save(location, 100)
+		d = Data.load(location)
+
+		assert sum(d.batch_gen(10), []) == lines
+		assert [len(b) for b in d.batch_gen(10)] == [10] * 10 + [3]
+		assert [len(b) for b in d.batch_gen(10, last='drop')] == [10] * 10
+		assert list(d.batch_gen(10, int, last='pad', fill=-1))[-1] == [100, 101, 102] + [-1] * 7
+		for pool in ('thread', 'process'):
+			batches = d.batch_gen(10, int, sum, workers=2, pool=pool, prefetch=3)
+			assert list(batches) == [sum(range(n, min(n + 10, 103))) for n in range(0, 103, 10)]
+		assert sum(d.batch_gen(10, lambda line: line + '!', workers=2), []) == [line + '!' for line in lines]
+		with raises(Exception, match='picklable'):
+			next(d.batch_gen(10, lambda line: line, workers=2, pool='process'))
+		with raises(Exception):
+			next(d.batch_gen(10, last='fill'))
+
+	def test_content_detection(self):
+		from puerml.library.data import DataReader
+		assert DataReader._sniff(b'') is None
+		assert DataReader._sniff(b'{"a": 1}\n' * 100) is False
+		assert DataReader._sniff('é'.encode('utf-8') * 100 + 'é'.encode('utf-8')[:1]) is False
+		assert DataReader._sniff(b'ab\x00cd') is True
+		assert DataReader._sniff('é'.encode('latin-1') * 100) is None
+
+		for name, content, binary in [('text.dat', b'line\n' * 10, False), ('binary.dat', bytes(range(256)), True)]:
+			location = os.path.join(self.location, '..', name)
+			with open(location, 'wb') as f:
+				f.write(content)
+			assert Data.load(location).reader._detect() is binary
+
+		location = os.path.join(self.location, '..', 'data.bin')
+		Data.set(b'line\n' * 10).save(location)
+		assert Data.load(location).reader._detect() is True
+		code = 'import sys, puerml; sys.exit("magic" in sys.modules)'
+		assert subprocess.run([sys.executable, '-c', code]).returncode == 0
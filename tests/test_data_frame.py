@@ -1,4 +1,5 @@
 import os
+import csv
 
 from puerml  import DataFrame
 from pytest  import fixture
@@ -41,4 +42,74 @@ class TestDataFrame:
 		self._assert_df(DataFrame.load(self.web_location_package))
 	
 	def test_load_web_single_file(self):
-		self._assert_df(DataFrame.load(self.web_location_single_file))
\ No newline at end of file
+		self._assert_df(DataFrame.load(self.web_location_single_file))
+
+	def test_open_parallel_single_file(self):
+		location = self.location.replace('.tsv', '_parallel.tsv')
+		DataFrame(self.header, self.rows).save(location)
+		for columnar in (False, True):
+			df = DataFrame.open(location, columnar=columnar, workers=3)
+			assert df.header == self.header
+			assert [list(row) for row in df] == self.rows
+
+	def test_open_parallel_package(self):
+		location = self.location.replace('.tsv', '_parallel_package.tsv')
+		DataFrame(self.header, self.rows).save(location, 200)
+		df = DataFrame.open(location, workers=2)
+		assert [list(row) for row in df] == self.rows
+
+	def test_shared_rows(self):
+		df  = DataFrame(self.header, self.rows)
+		sub = df.filter(lambda row, n: n < 2)
+		assert sub.rows[0] is df.rows[0] and df[1:].rows[0] is df.rows[1]
+		df.create_index(self.header[0])
+		sub = df.filter(lambda row, n: n < 2)
+		assert sub.rows[0] is not df.rows[0] and list(sub.rows[0]) == list(df.rows[0])
+
+	def test_save_load_quoted_fields(self):
+		rows = [
+			['plain', 'with,comma', 'with\ttab'],
+			['say "hi"', 'multi\nline', ''],
+			[1, 2.5, None],
+		]
+		for ext in ('csv', 'tsv'):
+			for max_size in (None, 20):
+				location = self.location.replace('.tsv', f'_quoted.{ext}')
+				DataFrame(['a', 'b', 'c'], rows).save(location, max_size)
+				df = DataFrame.load(location)
+				assert [list(row) for row in df] == [
+					['plain', 'with,comma', 'with\ttab'],
+					['say "hi"', 'multi\nline', ''],
+					['1', '2.5', ''],
+				]
+
+	def test_load_stray_quote(self):
+		location = self.location.replace('.tsv', '_stray_quote.csv')
+		with open(location, 'w') as f:
+			f.write('id,size\n1,5" screen\n2,7 inch\n')
+		for df in (DataFrame.load(location), DataFrame.open(location)):
+			assert [list(row) for row in df] == [['1', '5" screen'], ['2', '7 inch']]
+
+	def test_open_parallel_multiline_records(self):
+		rows = [[str(i), 'line "a"\nline b\n' * (i % 4) if i % 3 == 0 else 'x' * i] for i in range(100)]
+		for max_size in (None, 40):
+			location = self.location.replace('.tsv', '_parallel_multiline.csv')
+			DataFrame(['id', 'text'], rows).save(location, max_size)
+			for workers in (2, 7):
+				assert [list(row) for row in DataFrame.open(location, workers=workers)] == rows
+
+	def test_open_parallel_stray_quotes(self):
+		location = self.location.replace('.tsv', '_stray_quotes.csv')
+		with open(location, 'w') as f:
+			f.write('id,size\n' + ''.join(f'{i},{i % 20}" stray\n' if i % 7 == 0 else f'{i},"quoted\nfield"\n' if i % 11 == 0 else f'{i},7 inch\n' for i in range(2000)))
+		with open(location, newline='') as f:
+			serial = list(csv.reader(f))[1:]
+		assert len(serial) == 2000
+		for workers in (2, 4, 8):
+			assert [list(row) for row in DataFrame.open(location, workers=workers)] == serial
+
+	def test_compressed(self):
+		for max_size in (None, 200):
+			location = self.location.replace('.tsv', '_compressed.tsv.gz')
+			DataFrame(self.header, self.rows).save(location, max_size)
+			self._assert_df(DataFrame.load(location))
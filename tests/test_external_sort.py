@@ -0,0 +1,51 @@
+import os
+import random
+
+from puerml  import DataFrame, ColumnarDataFrame
+from pytest  import fixture
+
+from puerml.library.external_sort import ExternalSort
+
+
+class TestExternalSort:
+	@fixture(autouse=True, scope='class', name='setup_TestExternalSort')
+	def setup(cls, request, tmp_path_factory):
+		location = str(tmp_path_factory.mktemp('external_sort_test_dir'))
+		random.seed(1)
+		request.cls.tmp_dir      = location
+		request.cls.location     = os.path.join(location, 'test.tsv')
+		request.cls.out_location = os.path.join(location, 'sorted.tsv')
+		request.cls.header       = ['group', 'value', 'id']
+		request.cls.rows         = [[f'g{random.randint(0, 4)}', str(random.randint(10, 99)), str(i)] for i in range(200)]
+		request.cls.expected     = sorted(request.cls.rows, key=lambda row: (row[0], -int(row[1]), int(row[2])))
+		DataFrame(request.cls.header, request.cls.rows).save(request.cls.location, 500)
+
+	def test_spills_and_merges(self):
+		sort = ExternalSort(self.header, ['group', 'value'], [True, False], max_rows=30, max_size=100, tmp_dir=self.tmp_dir)
+		rows = sort.sort(iter(self.rows))
+		assert list(rows) == self.expected
+		assert not [name for name in os.listdir(self.tmp_dir) if name.startswith('puerml_sort_')]
+
+	def test_scan_sort_by_save(self):
+		plan = DataFrame.scan(self.location).sort_by(['group', 'value'], [True, False], max_rows=25)
+		plan.save(self.out_location, 400)
+		assert [list(row) for row in DataFrame.load(self.out_location)] == self.expected
+
+	def test_sort_by_multi_key(self):
+		for cls in (DataFrame, ColumnarDataFrame):
+			df = cls(self.header, self.rows)
+			df.sort_by(['group', 'value'], [True, False])
+			assert [list(row) for row in df] == self.expected
+
+	def test_top(self):
+		df = DataFrame(self.header, self.rows).top(5, ['group', 'value'], [True, False])
+		assert [list(row) for row in df] == self.expected[:5]
+		df = DataFrame.scan(self.location).top(5, ['group', 'value'], [True, False])
+		assert [list(row) for row in df] == self.expected[:5]
+
+	def test_sort_cutoff(self):
+		df = DataFrame(self.header, self.rows)
+		calls = []
+		df.sort(lambda row: calls.append(row) or int(row.get('value')), cutoff=90)
+		assert len(calls) == len(self.rows)
+		assert [row.get('value') for row in df] == sorted(row[1] for row in self.rows if int(row[1]) > 90)
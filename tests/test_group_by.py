@@ -0,0 +1,46 @@
+import os
+
+from puerml  import DataFrame, ColumnarDataFrame
+from pytest  import fixture, raises
+
+
+class TestGroupBy:
+	@fixture(autouse=True, scope='class', name='setup_TestGroupBy')
+	def setup(cls, request, tmp_path_factory):
+		request.cls.location = os.path.join(str(tmp_path_factory.mktemp('group_by_test_dir')), 'test.tsv')
+		request.cls.header   = ['city', 'kind', 'value']
+		request.cls.rows     = [[f'city{i % 2}', f'kind{i % 3}', str(i)] for i in range(10)]
+		DataFrame(request.cls.header, request.cls.rows).save(request.cls.location, 40)
+
+	def _result(self, df):
+		return {row[0]: row.to_dict() for row in df}
+
+	def test_agg(self):
+		df = DataFrame(self.header, self.rows).group_by('city').agg({
+			'value' : ['count', 'sum', 'mean', 'min', 'max', 'median'],
+			'kinds' : ('kind', 'distinct'),
+		})
+		assert df.header == ['city', 'value_count', 'value_sum', 'value_mean', 'value_min', 'value_max', 'value_median', 'kinds']
+		result = self._result(df)
+		assert result['city0'] == {
+			'city': 'city0', 'value_count': 5, 'value_sum': 20, 'value_mean': 4.0,
+			'value_min': 0, 'value_max': 8, 'value_median': 4, 'kinds': 3,
+		}
+
+	def test_multi_key_and_quantile(self):
+		df = ColumnarDataFrame(self.header, self.rows).cast('value', int)
+		df = df.group_by(['city', 'kind']).agg({'value': ['count', 'p50', 'p100']})
+		assert isinstance(df, ColumnarDataFrame)
+		assert len(df) == 6
+		row = df.where('kind', '==', 'kind0').where('city', '==', 'city0').rows[0]
+		assert list(row) == ['city0', 'kind0', 2, 3.0, 6.0]
+
+	def test_invalid_percentile(self):
+		for func in ('p150', 'p-5', 'pnan', 'px'):
+			with raises(Exception, match='Percentile out of range|Unsupported aggregation'):
+				DataFrame(self.header, self.rows).group_by('city').agg({'value': func})
+
+	def test_streaming(self):
+		in_memory = DataFrame(self.header, self.rows).group_by('kind').agg({'value': ['sum', 'max']})
+		streamed  = DataFrame.scan(self.location).group_by('kind', batch_size=3).agg({'value': ['sum', 'max']})
+		assert [list(row) for row in streamed] == [list(row) for row in in_memory]
@@ -0,0 +1,28 @@
+import sys
+import subprocess
+
+import puerml
+
+from pytest import raises
+
+
+class TestImports:
+	def _loaded(self, statement, modules):  # -> modules loaded by statement in a fresh interpreter
+		code   = f'import sys\n{statement}\nprint(",".join(m for m in {modules} if m in sys.modules))'
+		result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+		return [m for m in result.stdout.strip().split(',') if m]
+
+	def test_lazy_imports(self):
+		heavy = ['requests', 'magic', 'numpy', 'multiprocessing', 'asyncio', 'concurrent.futures', 'puerml.library.data']
+		assert self._loaded('import puerml', heavy) == []
+		assert self._loaded('from puerml import Jsonl', heavy) == ['puerml.library.data']
+		assert self._loaded('from puerml import Data, DataFrame', heavy) == ['puerml.library.data']
+		assert self._loaded('from puerml import *', heavy) == ['puerml.library.data']
+		assert self._loaded('from puerml import Jsonl, DataFrame, Data', ['puerml.library.columnar']) == []
+
+	def test_names(self):
+		assert set(puerml.__all__) >= {'Data', 'DataFrame', 'Jsonl', 'Schema', 'Cache', 'File', 'Pool'}
+		assert puerml.Jsonl is puerml.library.Jsonl
+		assert 'DataFrame' in dir(puerml.library)
+		with raises(AttributeError):
+			puerml.Missing
@@ -0,0 +1,73 @@
+from puerml  import DataFrame, ColumnarDataFrame
+from pytest  import fixture, mark
+
+
+@mark.parametrize('cls', [DataFrame, ColumnarDataFrame])
+class TestIndex:
+	@fixture(autouse=True, scope='class', name='setup_TestIndex')
+	def setup(cls, request):
+		request.cls.header = ['id', 'city', 'age']
+		request.cls.rows   = [[str(i), f'city{i % 3}', 20 + i] for i in range(10)]
+
+	def _df(self, cls):
+		return cls(self.header, self.rows).create_index('city').create_index('age', 'sorted')
+
+	def test_find(self, cls):
+		df = self._df(cls)
+		row, n = df.find('city', 'city2')
+		assert n == 2 and row.get('id') == '2'
+		assert df.find('city', 'nowhere') == (None, None)
+
+	def test_maintained_on_append_and_set(self, cls):
+		df = self._df(cls)
+		df.append(['10', 'kyiv', 30])
+		assert df.find('city', 'kyiv')[1] == 10
+		df.set('city', 10, 'lviv')
+		assert df.find('city', 'kyiv') == (None, None)
+		df.rows[3].set('city', 'odesa')
+		assert df.find('city', 'odesa')[1] == 3
+		assert sorted(df.to_unique_list('city')) == ['city0', 'city1', 'city2', 'lviv', 'odesa']
+
+	def test_maintained_on_map_col_and_filter(self, cls):
+		df = self._df(cls).map_col('city', str.upper)
+		assert df.find('city', 'CITY1')[1] == 1
+		df = df.filter(lambda row, n: n % 2 == 0)
+		assert set(df.indices) == {'city', 'age'}
+		assert df.find('city', 'CITY1')[1] == 2
+
+	def test_where(self, cls):
+		df = self._df(cls)
+		assert df.where('age', '>=', 27).to_list('id') == ['7', '8', '9']
+		assert df.where('age', '<', 22).to_list('id') == ['0', '1']
+		assert df.where('city', 'in', ['city1']).to_list('id') == ['1', '4', '7']
+		assert df.where('id', 'startswith', '1').to_list('id') == ['1']
+		df.create_index('id', 'sorted')
+		assert df.where('id', 'startswith', '1').to_list('id') == ['1']
+		assert df.where('city', '!=', 'city0').to_list('id') == ['1', '2', '4', '5', '7', '8']
+
+	def test_sort_rebuilds(self, cls):
+		df = self._df(cls)
+		df.sort_by('age', asc=False)
+		assert df.find('city', 'city0')[1] == 0
+		assert df.where('age', '==', 29).to_list('id') == ['9']
+
+	def test_results_keep_own_rows(self, cls):
+		df = self._df(cls)
+		sub = df.where('city', '==', 'city1')
+		sub.rows[0].set('city', 'kyiv')
+		assert df.find('city', 'city1')[1] == 1 and df.find('city', 'kyiv') == (None, None)
+		assert sub.find('city', 'kyiv')[1] == 0
+
+	def test_mixed_types(self, cls):
+		df = cls(['id', 'value'], [['0', 5], ['1', ''], ['2', 12], ['3', None], ['4', '12a'], ['5', 1.5]])
+		scan = [df.where('value', op, arg).to_list('id') for op, arg in [('<', 10), ('>=', ''), ('==', None), ('startswith', '1')]]
+		df.create_index('value', 'sorted')
+		assert [df.where('value', op, arg).to_list('id') for op, arg in [('<', 10), ('>=', ''), ('==', None), ('startswith', '1')]] == scan
+		assert scan == [['0', '5'], ['1', '4'], ['3'], ['2', '4', '5']]
+
+	def test_ljoin_index(self, cls):
+		cities = cls(['city', 'country'], [['city0', 'ua'], ['city1', 'pl']]).create_index('city')
+		cities.indices['city'].lookup = lambda value, lookup=cities.indices['city'].lookup: self.probes.append(value) or lookup(value)
+		self.probes = []
+		df = self._df(cls).ljoin(cities, 'city', 'city')
+		assert df.to_list('country')[:3] == ['ua', 'pl', ''] and len(self.probes) == 10
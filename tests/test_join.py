@@ -0,0 +1,55 @@
+from puerml  import DataFrame, ColumnarDataFrame
+from pytest  import fixture
+
+
+class TestHashJoin:
+	@fixture(autouse=True, scope='class', name='setup_TestHashJoin')
+	def setup(cls, request):
+		request.cls.left  = (['id', 'name'], [['1', 'a'], ['2', 'b'], ['3', 'c']])
+		request.cls.right = (['id', 'city'], [['2', 'x'], ['3', 'y'], ['3', 'z'], ['4', 'w']])
+
+	def _dfs(self, cls=DataFrame):
+		return cls(*self.left), cls(*self.right)
+
+	def _rows(self, df):
+		return sorted(list(row) for row in df)
+
+	def test_inner_many_to_many(self):
+		left, right = self._dfs()
+		df = left.join(right, 'id')
+		assert df.header == ['id', 'name', '_id', 'city']
+		assert self._rows(df) == [['2', 'b', '2', 'x'], ['3', 'c', '3', 'y'], ['3', 'c', '3', 'z']]
+
+	def test_left_right_outer(self):
+		left, right = self._dfs()
+		assert len(left.join(right, 'id', how='left'))  == 4
+		assert len(left.join(right, 'id', how='right')) == 4
+		df = left.join(right, 'id', how='outer')
+		assert self._rows(df)[0] == ['', '', '4', 'w']
+		assert len(df) == 5
+
+	def test_build_side_does_not_change_result(self):
+		left, right = self._dfs()
+		for how in ('inner', 'left', 'right', 'outer'):
+			a = left.join(right, 'id', how=how, build='left')
+			b = left.join(right, 'id', how=how, build='right')
+			assert self._rows(a) == self._rows(b)
+
+	def test_ljoin_keeps_inputs(self):
+		left, right = self._dfs()
+		df = left.ljoin(right, lambda row: row.get('id'), lambda row: row.get('id'))
+		assert [list(row) for row in df] == [['1', 'a', '', ''], ['2', 'b', '2', 'x'], ['3', 'c', '3', 'y']]
+		assert left.header == ['id', 'name'] and right.header == ['id', 'city']
+
+	def test_ljoin_columnar(self):
+		left, right = self._dfs(ColumnarDataFrame)
+		df = left.ljoin(right, lambda row: row.get('id'), lambda row: row.get('id'))
+		assert isinstance(df, ColumnarDataFrame)
+		assert df.to_list('city') == ['', 'x', 'y']
+
+	def test_match_copy_on(self):
+		left, right = self._dfs()
+		f  = lambda l, r: [l.get('name'), r.get('city')] if l.get('id') == r.get('id') else None
+		a  = left.match_copy(right, ['name', 'city'], f)
+		b  = left.match_copy(right, ['name', 'city'], f, on='id')
+		assert [list(row) for row in a] == [list(row) for row in b]
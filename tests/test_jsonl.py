@@ -1,5 +1,6 @@
 import os
 import json
+import math
 
 from inspect import isgenerator
 from pytest  import fixture
@@ -41,9 +42,73 @@ class TestJsonl:
 		assert json.dumps(loaded_data) == json.dumps(self.test_data), 'Mismatch saved and loaded data'
 
 	def test_load_web_package(self):
-		loaded_data = Jsonl.load(self.web_location_package, generator=False)
+		loaded_data = Jsonl.load(self.web_location_package, generator=False, escaped=True)
 		assert json.dumps(loaded_data) == json.dumps(self.test_data), 'Mismatch saved and loaded data'
 	
 	def test_load_web_single_file(self):
-		loaded_data = Jsonl.load(self.web_location_single_file, generator=False)
-		assert json.dumps(loaded_data) == json.dumps(self.test_data), 'Mismatch saved and loaded data'
\ No newline at end of file
+		loaded_data = Jsonl.load(self.web_location_single_file, generator=False, escaped=True)
+		assert json.dumps(loaded_data) == json.dumps(self.test_data), 'Mismatch saved and loaded data'
+
+	def test_escaped_format(self):
+		location = self.location.replace('.jsonl', '_escaped.jsonl')
+		Jsonl.save(self.test_data, location, escaped=True)
+		with open(location) as f:
+			assert '\\\\n' in f.readline()
+		assert Jsonl.load(location, generator=False, escaped=True) == self.test_data
+
+	def test_backends(self):
+		items = self.test_data + [{'path': 'c:\\new', 'big': 2**70, 'nan': float('inf'), 1: 'int key'}]
+		try:
+			for backend in ('json', 'orjson'):
+				Jsonl.use(backend)
+				location = self.location.replace('.jsonl', f'_{backend}.jsonl')
+				Jsonl.save(items, location, 500)
+				loaded = Jsonl.load(location, generator=False)
+				assert loaded[:-1] == self.test_data
+				assert loaded[-1] == {'path': 'c:\\new', 'big': 2**70, 'nan': float('inf'), '1': 'int key'}
+		finally:
+			Jsonl.use()
+
+	def test_non_finite(self):
+		items = [{'nan': float('nan'), 'inf': [float('inf'), -float('inf')]}]
+		try:
+			for backend in ('json', 'orjson'):
+				Jsonl.use(backend)
+				location = self.location.replace('.jsonl', f'_non_finite_{backend}.jsonl')
+				Jsonl.save(items, location)
+				loaded = Jsonl.load(location, generator=False)[0]
+				assert math.isnan(loaded['nan']) and loaded['inf'] == [float('inf'), -float('inf')]
+		finally:
+			Jsonl.use()
+		assert Jsonl.encode({'a': 1}) == json.dumps({'a': 1})
+
+	def test_workers(self):
+		items    = [{'id': i, 'text': f'line\n{i}'} for i in range(2500)]
+		location = self.location.replace('.jsonl', '_workers.jsonl')
+		for escaped in (False, True):
+			for max_size in (None, 5000):
+				Jsonl.save(iter(items), location, max_size, escaped=escaped, workers=3, batch_size=100)
+				assert Jsonl.load(location, generator=False, escaped=escaped) == items
+				loaded = Jsonl.load(location, escaped=escaped, workers=3, batch_size=70)
+				assert isgenerator(loaded)
+				assert list(loaded) == items
+
+	def test_projection(self):
+		items    = [{'id': i, 'lang': ['en', 'fr', 'é\\n"x'][i % 3], 'text': f't\n{i}'} for i in range(300)]
+		items   += [{'id': 300, 'text': 'no lang'}]
+		location = self.location.replace('.jsonl', '_projection.jsonl')
+		Jsonl.save(items, location, 3000)
+		for lang in ('en', 'é\\n"x'):
+			where    = [('lang', '==', lang), ('id', '>=', 100)]
+			expected = [{'id': item['id']} for item in items if item.get('lang') == lang and item['id'] >= 100]
+			assert Jsonl.load(location, generator=False, fields=['id'], where=where) == expected
+			assert list(Jsonl.load(location, fields=['id'], where=where, workers=2, batch_size=50)) == expected
+		assert Jsonl.load(location, generator=False, fields=['lang', 'missing'])[-1] == {}
+
+		df = Jsonl.to_dataframe(location, ['id', 'lang'], where=[('id', '<', 3)])
+		assert df.header == ['id', 'lang']
+		assert [list(row) for row in df.rows] == [[0, 'en'], [1, 'fr'], [2, 'é\\n"x']]
+		for workers in (None, 2):
+			df = Jsonl.to_dataframe(location, ['id', 'lang'], columnar=True, workers=workers, batch_size=40)
+			assert df.to_list('id', int) == list(range(301))
+			assert df.get('lang', 300) == ''
@@ -0,0 +1,248 @@
+import os
+import sys
+import asyncio
+import hashlib
+import threading
+import subprocess
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from puerml      import Cache, Data, DataFrame, Jsonl
+from pytest      import fixture
+
+from puerml.library.remote import RemoteReader
+
+
+class _Handler(BaseHTTPRequestHandler):
+	root     = None
+	requests = []
+	broken   = set()  # paths that drop the connection once, half way through
+
+	def log_message(self, *args):
+		pass
+
+	def do_GET(self):
+		_Handler.requests.append((self.path, self.headers.get('Range')))
+		path = os.path.join(self.root, self.path.lstrip('/'))
+		if not os.path.isfile(path):
+			self.send_error(404)
+			return
+		with open(path, 'rb') as f:
+			data = f.read()
+
+		etag = '"' + hashlib.md5(data).hexdigest() + '"'
+		if self.headers.get('If-None-Match') == etag:
+			self.send_response(304)
+			self.end_headers()
+			return
+
+		start = 0
+		if self.headers.get('Range'):
+			start = int(self.headers['Range'].split('=')[1].split('-')[0])
+			self.send_response(206)
+			self.send_header('Content-Range', f'bytes {start}-{len(data) - 1}/{len(data)}')
+		else:
+			self.send_response(200)
+		self.send_header('Content-Length', str(len(data) - start))
+		self.send_header('ETag', etag)
+		self.end_headers()
+
+		if self.path in _Handler.broken:
+			_Handler.broken.discard(self.path)
+			self.wfile.write(data[start:start + (len(data) - start) // 2])
+			self.close_connection = True
+			return
+		self.wfile.write(data[start:])
+
+
+	def do_HEAD(self):
+		path = os.path.join(self.root, self.path.lstrip('/'))
+		if not os.path.isfile(path):
+			self.send_error(404)
+			return
+		with open(path, 'rb') as f:
+			data = f.read()
+		self.send_response(200)
+		self.send_header('Content-Length', str(len(data)))
+		self.send_header('ETag', '"' + hashlib.md5(data).hexdigest() + '"')
+		self.end_headers()
+
+
+class TestRemoteReader:
+	@fixture(autouse=True, scope='class', name='setup_TestRemoteReader')
+	def setup(cls, request, tmp_path_factory):
+		root = str(tmp_path_factory.mktemp('remote_test_dir'))
+		_Handler.root = root
+		server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+		thread = threading.Thread(target=server.serve_forever, daemon=True)
+		thread.start()
+
+		request.cls.root      = root
+		request.cls.url       = f'http://127.0.0.1:{server.server_address[1]}'
+		request.cls.test_data = [{'id': i, 'text': f'line {i}'} for i in range(200)]
+		Jsonl.save(request.cls.test_data, os.path.join(root, 'package.jsonl'), 500)
+		Jsonl.save(request.cls.test_data, os.path.join(root, 'single.jsonl'))
+		yield
+		server.shutdown()
+
+	def test_package_in_order(self):
+		parts = len(os.listdir(os.path.join(self.root, 'package.jsonl')))
+		assert parts > RemoteReader.read_ahead
+		assert Jsonl.load(f'{self.url}/package.jsonl', generator=False) == self.test_data
+
+	def test_single_file(self):
+		assert Jsonl.load(f'{self.url}/single.jsonl', generator=False) == self.test_data
+
+	def test_missing(self):
+		try:
+			list(Data.load(f'{self.url}/missing.jsonl').line_gen)
+			assert False, 'FileNotFoundError expected'
+		except FileNotFoundError:
+			pass
+
+	def test_resume_with_range(self):
+		_Handler.requests.clear()
+		_Handler.broken.add('/package.jsonl/1')
+		assert Jsonl.load(f'{self.url}/package.jsonl', generator=False) == self.test_data
+		ranges = [r for path, r in _Handler.requests if path == '/package.jsonl/1']
+		assert ranges[0] is None and ranges[1].startswith('bytes=')
+
+	def test_random_access(self):
+		lines = [Jsonl.encode(item) for item in self.test_data]
+		d = Data.load(f'{self.url}/package.jsonl')
+		assert d.num_lines == len(lines)
+		_Handler.requests.clear()
+		assert d[150:153] == lines[150:153]
+		assert all(r is not None and r.startswith('bytes=') for _, r in _Handler.requests)
+
+	def test_random_access_revalidated(self):
+		for max_size in (None, 500):
+			location = os.path.join(self.root, f'changing_{max_size}.jsonl')
+			Jsonl.save(self.test_data[:100], location, max_size)
+			assert Data.load(f'{self.url}/changing_{max_size}.jsonl').num_lines == 100
+			Jsonl.save(self.test_data[:120], location, max_size)
+			d = Data.load(f'{self.url}/changing_{max_size}.jsonl')
+			assert d.num_lines == 120 and d[119] == Jsonl.encode(self.test_data[119])
+
+	def test_compressed(self):
+		Jsonl.save(self.test_data, os.path.join(self.root, 'compressed.jsonl.gz'), 500)
+		Jsonl.save(self.test_data, os.path.join(self.root, 'compressed_single.jsonl.xz'))
+		assert Jsonl.load(f'{self.url}/compressed.jsonl.gz', generator=False) == self.test_data
+		assert Jsonl.load(f'{self.url}/compressed_single.jsonl.xz', generator=False) == self.test_data
+
+	def test_unzip(self):
+		Data.zip(os.path.join(self.root, 'package.jsonl')).save(os.path.join(self.root, 'package.zip'), 700)
+		target = os.path.join(self.root, 'unzipped')
+		Data.load(f'{self.url}/package.zip').unzip(target)
+		assert Jsonl.load(target, generator=False) == self.test_data
+
+	def test_async(self):
+		async def read(location):
+			d       = await Data.aload(location)
+			lines   = [line async for line in d.line_gen]
+			batches = [batch async for batch in d.batch_gen(7, last='pad')]
+			async for line in d.line_gen:
+				break
+			return d, lines, batches
+
+		for name in ('package.jsonl', 'single.jsonl'):
+			for location in (os.path.join(self.root, name), f'{self.url}/{name}'):
+				d, lines, batches = asyncio.run(read(location))
+				assert lines == list(Data.load(location).line_gen)
+				assert batches == list(Data.load(location).batch_gen(7, last='pad'))
+				assert d.type == 'jsonl'
+
+		async def chunks(location):
+			d = await Data.aload(location)
+			return [chunk async for chunk in d.chunk_gen(100)]
+
+		location = os.path.join(self.root, 'async.bin')
+		Data.set(bytes(range(256)) * 10).save(location, 1000)
+		assert b''.join(asyncio.run(chunks(f'{self.url}/async.bin'))) == bytes(range(256)) * 10
+
+		async def detect_threads(location):  # type detection and manifest requests stay off the event loop
+			d       = await Data.aload(location)
+			threads = []
+			detect  = d.reader._detect
+			d.reader._detect = lambda: threads.append(threading.get_ident()) or detect()
+			assert len([chunk async for chunk in d.chunk_gen(100)]) == 26
+			return threads
+
+		threads = asyncio.run(detect_threads(f'{self.url}/async.bin'))
+		assert threads and threading.get_ident() not in threads
+
+	def test_cache(self):
+		cache = Cache.use(os.path.join(self.root, '..', 'cache'))
+		try:
+			for _ in range(2):
+				_Handler.requests.clear()
+				assert Jsonl.load(f'{self.url}/package.jsonl', generator=False) == self.test_data
+				assert Jsonl.load(f'{self.url}/single.jsonl', generator=False) == self.test_data
+			# parts by checksum without requests, manifest and single file revalidated
+			paths = [path for path, _ in _Handler.requests]
+			assert [p for p in paths if p.startswith('/package.jsonl/')] == ['/package.jsonl/manifest.json']
+			assert paths.count('/single.jsonl') == 1
+
+			header   = ['a', 'b']
+			location = os.path.join(self.root, 'cached.csv')
+			for n in range(2):
+				DataFrame(header, [[str(n), 'x']]).save(location)
+				assert DataFrame.load(f'{self.url}/cached.csv').get('a', 0) == str(n)
+			assert len(os.listdir(os.path.join(cache.location, 'urls'))) == 3
+
+			cache.max_size = 1000
+			cache.evict()
+			assert cache.size <= 1000
+			assert Jsonl.load(f'{self.url}/package.jsonl', generator=False) == self.test_data
+		finally:
+			Cache.use(None)
+
+	def test_cache_running_size(self):
+		cache   = Cache(os.path.join(self.root, '..', 'cache_size'), max_size=1000)
+		evicted = []
+		evict   = cache.evict
+		cache.evict = lambda: evicted.append(cache._size) or evict()
+		for n in range(12):
+			file = cache.temp()
+			file.write(b'x' * 100)
+			cache.store(file, f'{self.url}/{n}', etag=f'"{n}"')
+			file.close()
+		assert evicted == [1100, 1100] and cache.size == cache._size <= 1000
+
+		location = os.path.join(self.root, '..', 'cache_env')
+		code     = f'import os, puerml\nfrom puerml import Cache, Jsonl\nprint(os.path.exists({location!r}), Cache.current().location)'
+		result   = subprocess.run([sys.executable, '-c', code], env={**os.environ, 'PUERML_CACHE': location}, capture_output=True, text=True, check=True)
+		assert result.stdout.split() == ['False', location]
+
+	def test_save_single_file(self):
+		lines = [Jsonl.encode(item) for item in self.test_data]
+		Jsonl.save(self.test_data, os.path.join(self.root, 'saved_single.jsonl.xz'))
+		for name in ('single.jsonl', 'package.jsonl', 'saved_single.jsonl.xz'):
+			for source in (f'{self.url}/{name}', os.path.join(self.root, name)):
+				target = os.path.join(self.root, '..', f'saved_{name}.txt')
+				Data.load(source).save(target)
+				assert list(Data.load(target).line_gen) == lines
+
+	def test_cache_threads(self):
+		cache = Cache(os.path.join(self.root, '..', 'cache_threads'), max_size=5000)
+		def store(n):
+			for m in range(20):
+				file = cache.temp()
+				file.write(b'x' * (n + 1))
+				cache.store(file, f'{self.url}/{n}/{m}', etag=f'"{n}"')
+				file.close()
+		threads = [threading.Thread(target=store, args=(n,)) for n in range(8)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		assert cache._size == cache.size == sum(20 * (n + 1) for n in range(8))
+
+	def test_save_binary_package(self):
+		data = bytes(range(256)) * 40
+		for name in ('remote.bin', 'remote.dat'):
+			with open(os.path.join(self.root, name), 'wb') as f:
+				f.write(data)
+			target = os.path.join(self.root, '..', f'saved_{name}')
+			Data.load(f'{self.url}/{name}').save(target, 1000)
+			assert len(Data.load(target).manifest.parts) == 11
+			assert b''.join(Data.load(target).chunk_gen(4096)) == data
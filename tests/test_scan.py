@@ -0,0 +1,47 @@
+import os
+
+from puerml  import DataFrame, DataFrameScan
+from pytest  import fixture
+
+
+class TestDataFrameScan:
+	@fixture(autouse=True, scope='class', name='setup_TestDataFrameScan')
+	def setup(cls, request, tmp_path_factory):
+		location = str(tmp_path_factory.mktemp('scan_test_dir'))
+		request.cls.location     = os.path.join(location, 'test.tsv')
+		request.cls.out_location = os.path.join(location, 'out.tsv')
+		request.cls.header       = ['id', 'city', 'age']
+		request.cls.rows         = [[str(i), f'city{i % 3}', str(20 + i)] for i in range(30)]
+		DataFrame(request.cls.header, request.cls.rows).save(request.cls.location, 100)
+
+	def test_lazy(self):
+		plan = DataFrame.scan(self.location).filter(lambda row, n: False)
+		assert isinstance(plan, DataFrameScan)
+		assert plan.filter(lambda row, n: True).steps != plan.steps
+
+	def test_pipeline(self):
+		plan = (DataFrame.scan(self.location)
+			.filter(lambda row, n: row.get('city') == 'city1')
+			.cast('age', int)
+			.map_col('age', lambda age: str(age * 2))
+			.alter(['id', 'age'])
+		)
+		assert plan.to_list('age', int) == [2 * (20 + i) for i in range(1, 30, 3)]
+		df = plan.collect()
+		assert df.header == ['id', 'age']
+		assert len(df) == 10
+
+	def test_transform(self):
+		plan = DataFrame.scan(self.location).transform(['label'], lambda row: [row.get('city') + row.get('id')])
+		assert plan.to_list('label')[:2] == ['city00', 'city11']
+
+	def test_save_package(self):
+		DataFrame.scan(self.location).filter(lambda row, n: n < 20).save(self.out_location, 50)
+		assert len(os.listdir(self.out_location)) > 1
+		df = DataFrame.load(self.out_location)
+		assert [list(row) for row in df] == self.rows[:20]
+
+	def test_save_single_file(self):
+		DataFrame.scan(self.location).save(self.out_location)
+		assert os.path.isfile(self.out_location)
+		assert [list(row) for row in DataFrame.load(self.out_location)] == self.rows
@@ -0,0 +1,65 @@
+import os
+import math
+
+from datetime import datetime
+from puerml   import DataFrame, Jsonl, Schema, ColumnStore
+from pytest   import fixture
+
+
+class TestSchema:
+	@fixture(autouse=True, scope='class', name='setup_TestSchema')
+	def setup(cls, request, tmp_path_factory):
+		request.cls.location = str(tmp_path_factory.mktemp('schema_test_dir'))
+		request.cls.header   = ['id', 'score', 'flag', 'day', 'city', 'meta', 'name', 'gap']
+		request.cls.rows     = [
+			[str(i), f'{i / 4}', ['true', 'False'][i % 2], f'2024-01-{i % 28 + 1:02}', f'city{i % 3}', f'{{"n": {i}}}', f'name{i}', '' if i % 5 else str(i)]
+			for i in range(40)
+		]
+		request.cls.records  = [
+			{'id': i, 'score': i if i % 2 else i / 2, 'flag': i % 2 == 0, 'day': f'2024-02-{i % 28 + 1:02}', 'meta': {'n': i}, 'mixed': [i, 'x'][i % 2]}
+			for i in range(40)
+		]
+
+	def test_infer(self):
+		schema = Schema.infer(self.rows, self.header)
+		assert schema.types == {
+			'id': 'int', 'score': 'float', 'flag': 'bool', 'day': 'datetime',
+			'city': 'category', 'meta': 'json', 'name': 'str', 'gap': 'float',
+		}
+		assert Schema.infer([{'zip': '02134'}, {'zip': '10001'}, {'zip': '00.5'}]).types == {'zip': 'str'}
+		assert Schema.infer([{'n': '0'}, {'n': '-12'}, {'n': '+3'}]).types == {'n': 'int'}
+		schema = Schema.infer(self.records)
+		assert schema.types == {
+			'id': 'int', 'score': 'float', 'flag': 'bool', 'day': 'datetime', 'meta': 'json', 'mixed': 'object',
+		}
+
+	def test_dataframe(self):
+		location = os.path.join(self.location, 'test.tsv')
+		DataFrame(self.header, self.rows).save(location)
+
+		df = DataFrame.load(location, columnar=True, schema=True)
+		assert [c.kind for c in df.columns] == ['int', 'float', 'bool', 'object', 'str', 'object', 'str', 'float']
+		assert df.get('id', 3) == 3 and df.get('score', 3) == 0.75 and df.get('flag', 3) is False
+		assert df.get('day', 3) == datetime(2024, 1, 4)
+		assert df.get('meta', 3) == {'n': 3}
+		assert math.isnan(df.get('gap', 3)) and df.get('gap', 5) == 5.0
+		assert df.where('id', '>', 36).to_list('id', int) == [37, 38, 39]
+
+		df = DataFrame.load(location, schema=Schema({'id': 'int', 'flag': 'bool'}), where=[('id', '<', 2)])
+		assert [row[:3] for row in df.rows] == [[0, '0.0', True], [1, '0.25', False]]
+
+		store = os.path.join(self.location, 'test.pcol')
+		DataFrame.load(location, columnar=True, schema=True).alter(['id', 'flag']).save(store)
+		assert ColumnStore.load(store).to_list('flag', bool) == [i % 2 == 0 for i in range(40)]
+
+	def test_jsonl(self):
+		location = os.path.join(self.location, 'test.jsonl')
+		Jsonl.save(self.records, location)
+
+		records = Jsonl.load(location, generator=False, schema=True)
+		assert records[1]['day'] == datetime(2024, 2, 2)
+		assert records[1]['score'] == 1.0 and type(records[1]['score']) is float
+
+		df = Jsonl.to_dataframe(location, ['id', 'score', 'flag', 'day'], columnar=True, schema=True)
+		assert [c.kind for c in df.columns] == ['int', 'float', 'bool', 'object']
+		assert df.get('day', 0) == datetime(2024, 2, 1)